@@ -1,5 +1,6 @@
 import logging
 from pathlib import Path
+from typing import List, Optional
 from .smartdoc_sem_ia import main as generate_doc
 from src.utils.config import OUTPUT_DIR
 
@@ -7,7 +8,8 @@ logger = logging.getLogger(__name__)
 
 class DocumentGenerator:
     @staticmethod
-    def generate(arquivo_pbit: str, modelo_word: str) -> bool:
+    def generate(arquivo_pbit: str, modelo_word: str, secoes: Optional[List[str]] = None,
+                 formato_catalogo: Optional[str] = None, volumes: bool = False) -> bool:
         """
         Gera a documentação do Power BI usando o arquivo PBIT e o modelo Word fornecidos.
         O arquivo será salvo automaticamente no diretório output.
@@ -15,6 +17,9 @@ class DocumentGenerator:
         Args:
             arquivo_pbit (str): Caminho para o arquivo .pbit
             modelo_word (str): Caminho para o modelo .docx
+            secoes (Optional[List[str]]): Seções a gerar; None usa as presentes no modelo
+            formato_catalogo (Optional[str]): "xlsx" ou "csv" para exportar também o catálogo
+            volumes (bool): Divide a documentação em um volume por seção, mais um índice
             
         Returns:
             bool: True se a geração foi bem sucedida, False caso contrário
@@ -28,8 +33,8 @@ class DocumentGenerator:
             nome_saida = arquivo_pbit_path.stem + "_documentado.docx"
             caminho_saida = str(OUTPUT_DIR / nome_saida)
             
-            generate_doc(arquivo_pbit, modelo_word, str(OUTPUT_DIR))
-            return True
+            resultado = generate_doc(arquivo_pbit, modelo_word, str(OUTPUT_DIR), secoes, formato_catalogo, volumes)
+            return resultado is not None
         except Exception as ex:
             logger.exception("Erro ao gerar documentação")
             raise ex
@@ -0,0 +1,236 @@
+"""
+Representação tabular do modelo Power BI
+----------------------------------------
+
+Converte o DataModelSchema e o Layout em DataFrames colunares (colunas, medidas,
+partições, relacionamentos e visuais). Os DataFrames alimentam a seção de
+estatísticas, calculada com agrupamentos vetorizados, e a exportação do
+catálogo completo para Excel ou CSV.
+"""
+
+import os
+import logging
+from typing import Any, Dict, List
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from src.core.report_common import (
+    JsonDict,
+    eh_tabela_auxiliar,
+    iterar_relacionamentos,
+    iterar_visuais,
+    juntar_expressao,
+)
+
+logger = logging.getLogger(__name__)
+
+# Chamadas de função DAX, ex.: CALCULATE(, SUMX(, DATESYTD(
+PADRAO_FUNCAO_DAX = r"\b[A-Za-z][A-Za-z0-9\.]*\s*\("
+
+FORMATOS_CATALOGO = ("xlsx", "csv")
+
+# Máximo de caracteres em uma célula do Excel; acima disso o arquivo precisa ser "reparado"
+LIMITE_CELULA_EXCEL = 32767
+
+
+def criar_dataframes(model_data: JsonDict, layout_data: JsonDict) -> Dict[str, pd.DataFrame]:
+    """
+    Monta os DataFrames do catálogo a partir do modelo e do layout.
+
+    As linhas são acumuladas em listas de tuplas e convertidas de uma só vez,
+    evitando o custo de crescer um DataFrame linha a linha.
+
+    Args:
+        model_data (JsonDict): Conteúdo do arquivo DataModelSchema
+        layout_data (JsonDict): Conteúdo do arquivo Report/Layout
+
+    Returns:
+        Dict[str, pd.DataFrame]: Nome do catálogo -> DataFrame
+    """
+    colunas, medidas, particoes = [], [], []
+    for table in model_data.get('model', {}).get('tables', []):
+        table_name = table.get("name", "")
+        auxiliar = eh_tabela_auxiliar(table_name)
+        for measure in table.get('measures', []):
+            medidas.append((
+                table_name,
+                measure.get('name', ''),
+                juntar_expressao(measure.get('expression', '')) or '',
+                measure.get('formatString', ''),
+                measure.get('lineageTag', ''),
+            ))
+        if auxiliar:
+            continue
+        for column in table.get('columns', []):
+            colunas.append((
+                table_name,
+                column.get("name", ""),
+                column.get('dataType', ""),
+                column.get('type', "") in ['calculatedTableColumn', 'calculated'],
+                column.get('lineageTag', ''),
+            ))
+        for partition in table.get('partitions', []):
+            source = partition.get('source', {})
+            particoes.append((
+                table_name,
+                partition.get('name', ''),
+                partition.get('mode'),
+                source.get('type'),
+                juntar_expressao(source.get('expression')),
+            ))
+
+    relacionamentos = [
+        (
+            relation.get('name', ''),
+            relation.get('fromTable'),
+            relation.get('fromColumn', ''),
+            relation.get('toTable'),
+            relation.get('toColumn', ''),
+            relation.get('crossFilteringBehavior', 'oneDirection'),
+            relation.get('isActive', True),
+        )
+        for relation, _ in iterar_relacionamentos(model_data)
+    ]
+
+    visuais = [
+        (
+            visual["pagina"],
+            visual["nome"],
+            visual["tipo"],
+            visual["x"],
+            visual["y"],
+            visual["altura"],
+            visual["largura"],
+            ", ".join(visual["campos"]),
+        )
+        for visual in iterar_visuais(layout_data)
+    ]
+
+    frames = {
+        "colunas": pd.DataFrame.from_records(
+            colunas, columns=["tabela", "coluna", "tipo_dados", "calculada", "lineage_tag"]),
+        "medidas": pd.DataFrame.from_records(
+            medidas, columns=["tabela", "medida", "expressao", "formato", "lineage_tag"]),
+        "particoes": pd.DataFrame.from_records(
+            particoes, columns=["tabela", "particao", "modo", "tipo", "expressao"]),
+        "relacionamentos": pd.DataFrame.from_records(
+            relacionamentos, columns=["nome", "tabela_origem", "coluna_origem", "tabela_destino",
+                                      "coluna_destino", "filtro_cruzado", "ativo"]),
+        "visuais": pd.DataFrame.from_records(
+            visuais, columns=["pagina", "visual", "tipo", "x", "y", "altura", "largura", "campos"]),
+    }
+    medidas_df = frames["medidas"]
+    medidas_df.drop_duplicates(subset=["tabela", "medida"], inplace=True)
+    medidas_df["tamanho"] = medidas_df["expressao"].str.len()
+    medidas_df["funcoes"] = medidas_df["expressao"].str.count(PADRAO_FUNCAO_DAX)
+    return frames
+
+
+def _formatar_contagem(serie: pd.Series) -> List[str]:
+    """Formata uma série de contagens como linhas "chave: valor"."""
+    return [f"{chave}: {valor}" for chave, valor in serie.items()]
+
+
+def extrair_estatisticas(frames: Dict[str, pd.DataFrame]) -> str:
+    """Extrai estatísticas do modelo em formato Markdown."""
+    colunas = frames["colunas"]
+    medidas = frames["medidas"]
+    visuais = frames["visuais"]
+    markdown_output = [""]
+
+    por_tipo = colunas.groupby("tipo_dados", sort=True).size()
+    markdown_output.append(
+        "Colunas por tipo de dados\n"
+        + "\n".join(_formatar_contagem(por_tipo))
+        + "\n-----------\n"
+    )
+
+    total_colunas = len(colunas)
+    calculadas = int(colunas["calculada"].sum())
+    proporcao = calculadas / total_colunas if total_colunas else 0.0
+    markdown_output.append(
+        f"Total de colunas: {total_colunas}\n"
+        f"Colunas calculadas: {calculadas} ({proporcao:.1%})\n"
+        "-----------\n"
+    )
+
+    if len(medidas):
+        tamanho = medidas["tamanho"].describe()
+        faixas = pd.cut(
+            medidas["funcoes"],
+            bins=[-1, 0, 2, 5, 10, float("inf")],
+            labels=["0 funções", "1-2 funções", "3-5 funções", "6-10 funções", "mais de 10 funções"],
+        ).value_counts(sort=False)
+        markdown_output.append(
+            f"Total de medidas: {len(medidas)}\n"
+            f"Tamanho das expressões (caracteres): mínimo {int(tamanho['min'])}, "
+            f"médio {tamanho['mean']:.1f}, mediana {tamanho['50%']:.0f}, máximo {int(tamanho['max'])}\n"
+            "Complexidade (chamadas de função DAX)\n"
+            + "\n".join(_formatar_contagem(faixas))
+            + "\n-----------\n"
+        )
+    else:
+        markdown_output.append("Total de medidas: 0\n-----------\n")
+
+    por_pagina = visuais.groupby("pagina", sort=False).size()
+    markdown_output.append(
+        "Visuais por página\n"
+        + "\n".join(_formatar_contagem(por_pagina))
+        + "\n-----------\n"
+    )
+    return "\n".join(markdown_output)
+
+
+def _valor_celula(valor: Any) -> Any:
+    """Remove caracteres de controle inválidos no XML e corta o texto no limite da célula."""
+    if isinstance(valor, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", valor)[:LIMITE_CELULA_EXCEL]
+    return valor
+
+
+def exportar_catalogo(frames: Dict[str, pd.DataFrame], diretorio_saida: str, nome_BI: str,
+                      formato: str = "xlsx") -> List[str]:
+    """
+    Exporta os DataFrames do catálogo em lote.
+
+    Args:
+        frames (Dict[str, pd.DataFrame]): DataFrames gerados por criar_dataframes
+        diretorio_saida (str): Diretório onde os arquivos serão salvos
+        nome_BI (str): Nome do relatório, usado como prefixo dos arquivos
+        formato (str, optional): "xlsx" (uma planilha por catálogo) ou "csv"
+            (um arquivo por catálogo). Defaults to "xlsx"
+
+    Returns:
+        List[str]: Caminhos dos arquivos gerados
+
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    if formato not in FORMATOS_CATALOGO:
+        raise ValueError(f"Formato de catálogo não suportado: {formato}")
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    if formato == "xlsx":
+        caminho = os.path.join(diretorio_saida, f"{nome_BI}_catalogo.xlsx")
+        # Modo write_only grava as linhas em fluxo, sem montar as células em memória
+        workbook = Workbook(write_only=True)
+        for nome, frame in frames.items():
+            worksheet = workbook.create_sheet(title=nome)
+            worksheet.append(list(frame.columns))
+            valores = frame.astype(object).where(frame.notna(), None)
+            for linha in valores.itertuples(index=False, name=None):
+                worksheet.append([_valor_celula(valor) for valor in linha])
+        workbook.save(caminho)
+        caminhos = [caminho]
+    else:
+        caminhos = []
+        for nome, frame in frames.items():
+            caminho = os.path.join(diretorio_saida, f"{nome_BI}_{nome}.csv")
+            frame.to_csv(caminho, index=False, encoding="utf-8-sig")
+            caminhos.append(caminho)
+
+    for caminho in caminhos:
+        logger.info(f"Catálogo exportado: {caminho}")
+    return caminhos
@@ -0,0 +1,300 @@
+"""
+Verificação de boas práticas do modelo e do relatório
+-----------------------------------------------------
+
+Motor de regras que percorre o modelo semântico e o layout uma única vez. Cada
+objeto visitado (tabela, coluna, medida, relacionamento, visual, página) é
+entregue apenas às regras registradas para o seu tipo, de modo que o custo total
+é um percurso, e não um laço por regra.
+
+Novas regras são acrescentadas com o decorador `registrar_regra`:
+
+    @registrar_regra("QA100", "Medida sem descrição", "medida", "info")
+    def medida_sem_descricao(medida, contexto):
+        if not medida["objeto"].get("description"):
+            yield "A medida não possui descrição"
+
+O resultado alimenta a seção "Qualidade" da documentação e o relatório em JSON.
+"""
+
+import json
+import heapq
+import bisect
+import logging
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.report_common import (
+    JsonDict,
+    SEPARADOR_REGISTRO,
+    eh_tabela_auxiliar,
+    iterar_relacionamentos,
+    iterar_visuais,
+    salvar_versao,
+)
+
+logger = logging.getLogger(__name__)
+
+# Regra: recebe o objeto visitado e o contexto do percurso e produz mensagens
+FuncaoRegra = Callable[[JsonDict, JsonDict], Optional[Iterable[str]]]
+
+# Tipos de objeto visitados, na ordem do percurso
+TIPOS_OBJETO = ("relacionamento", "tabela", "coluna", "medida", "visual", "pagina")
+SEVERIDADES = ("erro", "aviso", "info")
+
+# Tabelas com pelo menos este número de colunas são tratadas como grandes
+LIMITE_COLUNAS_TABELA_GRANDE = 30
+# Tamanho padrão da página quando o layout não o informa
+LARGURA_PAGINA_PADRAO = 1280
+ALTURA_PAGINA_PADRAO = 720
+# Visuais que costumam ficar sob ou sobre outros de propósito (fundos, rótulos, botões)
+TIPOS_DECORATIVOS = {"shape", "basicShape", "image", "textbox", "actionButton"}
+
+# Regras registradas por tipo de objeto
+REGRAS: Dict[str, List[JsonDict]] = {tipo: [] for tipo in TIPOS_OBJETO}
+
+
+def registrar_regra(codigo: str, descricao: str, objeto: str,
+                    severidade: str = "aviso") -> Callable[[FuncaoRegra], FuncaoRegra]:
+    """
+    Registra uma regra de qualidade para um tipo de objeto.
+
+    Args:
+        codigo (str): Identificador da regra, ex.: "QA001"
+        descricao (str): Descrição curta exibida no relatório
+        objeto (str): Tipo de objeto verificado (ver TIPOS_OBJETO)
+        severidade (str, optional): "erro", "aviso" ou "info". Defaults to "aviso"
+
+    Returns:
+        Callable: Decorador que devolve a própria função da regra
+
+    Raises:
+        ValueError: Se o tipo de objeto ou a severidade forem desconhecidos
+    """
+    if objeto not in REGRAS:
+        raise ValueError(f"Tipo de objeto desconhecido: {objeto}")
+    if severidade not in SEVERIDADES:
+        raise ValueError(f"Severidade desconhecida: {severidade}")
+
+    def decorador(funcao: FuncaoRegra) -> FuncaoRegra:
+        REGRAS[objeto] = [r for r in REGRAS[objeto] if r["codigo"] != codigo]
+        REGRAS[objeto].append({"codigo": codigo, "descricao": descricao,
+                               "severidade": severidade, "funcao": funcao})
+        return funcao
+
+    return decorador
+
+
+def _percorrer(layout_data: JsonDict, model_data: JsonDict, contexto: JsonDict) -> Iterator[Tuple[str, JsonDict]]:
+    """
+    Percorre modelo e layout uma única vez, produzindo (tipo, objeto).
+
+    Os relacionamentos vêm primeiro para que o contexto já saiba quais tabelas são
+    fato quando as colunas forem visitadas; cada página vem depois dos seus visuais,
+    já com a lista deles, para as regras que comparam visuais entre si.
+    """
+    model = model_data.get("model", {})
+    tabelas_fato = contexto.setdefault("tabelas_fato", set())
+
+    for relation, rotulo in iterar_relacionamentos(model_data):
+        tabelas_fato.add(relation.get("fromTable", ""))
+        yield "relacionamento", {"rotulo": rotulo, "objeto": relation}
+
+    for table in model.get("tables", []):
+        table_name = table.get("name", "")
+        for measure in table.get("measures", []):
+            yield "medida", {"rotulo": f"{table_name}[{measure.get('name', '')}]", "objeto": measure}
+        if eh_tabela_auxiliar(table_name):
+            continue
+        columns = table.get("columns", [])
+        tabela = {
+            "rotulo": table_name,
+            "objeto": table,
+            "grande": table_name in tabelas_fato or len(columns) >= LIMITE_COLUNAS_TABELA_GRANDE,
+        }
+        yield "tabela", tabela
+        for column in columns:
+            yield "coluna", {"rotulo": f"{table_name}[{column.get('name', '')}]", "objeto": column, "tabela": tabela}
+
+    for section in layout_data.get("sections", []):
+        pagina = {
+            "rotulo": section.get("displayName", "Sem Nome"),
+            "objeto": section,
+            "largura": section.get("width") or LARGURA_PAGINA_PADRAO,
+            "altura": section.get("height") or ALTURA_PAGINA_PADRAO,
+            "visuais": [],
+        }
+        for visual in iterar_visuais({"sections": [section]}):
+            pagina["visuais"].append(visual)
+            yield "visual", {"rotulo": f"{pagina['rotulo']}/{visual['nome']} ({visual['tipo'] or 'grupo'})",
+                             "objeto": visual, "pagina": pagina}
+        yield "pagina", pagina
+
+
+def executar_regras(layout_data: JsonDict, model_data: JsonDict,
+                    codigos: Optional[Iterable[str]] = None) -> List[JsonDict]:
+    """
+    Executa as regras registradas sobre o modelo e o layout em um único percurso.
+
+    Args:
+        layout_data (JsonDict): Layout do relatório
+        model_data (JsonDict): Modelo semântico
+        codigos (Optional[Iterable[str]]): Regras a executar. Se None, executa todas
+
+    Returns:
+        List[JsonDict]: Achados com regra, descrição, severidade, tipo, objeto e mensagem
+    """
+    selecionadas = set(codigos) if codigos is not None else None
+    regras = {
+        tipo: [r for r in lista if selecionadas is None or r["codigo"] in selecionadas]
+        for tipo, lista in REGRAS.items()
+    }
+
+    achados = []
+    contexto: JsonDict = {}
+    for tipo, objeto in _percorrer(layout_data, model_data, contexto):
+        for regra in regras[tipo]:
+            try:
+                mensagens = regra["funcao"](objeto, contexto) or ()
+                for mensagem in mensagens:
+                    achados.append({
+                        "regra": regra["codigo"],
+                        "descricao": regra["descricao"],
+                        "severidade": regra["severidade"],
+                        "tipo": tipo,
+                        "objeto": objeto["rotulo"],
+                        "mensagem": mensagem,
+                    })
+            except Exception as e:
+                logger.error(f"Erro na regra {regra['codigo']} ({objeto['rotulo']}): {e}")
+
+    logger.info(f"Verificação de qualidade concluída: {len(achados)} achados")
+    return achados
+
+
+def _retangulo(visual: JsonDict) -> Tuple[float, float, float, float]:
+    x, y = float(visual["x"] or 0), float(visual["y"] or 0)
+    return x, y, x + float(visual["largura"] or 0), y + float(visual["altura"] or 0)
+
+
+def pares_sobrepostos(visuais: List[JsonDict]) -> List[Tuple[int, int]]:
+    """
+    Encontra os pares de visuais cujas áreas se sobrepõem.
+
+    Varredura ordenada pelo eixo x: os visuais entram em ordem de borda esquerda e
+    saem (por um heap da borda direita) assim que deixam de cruzar a linha de
+    varredura. Os visuais ativos ficam ordenados pela borda superior, e cada novo
+    visual só é comparado, por busca binária, com os que começam na faixa de y em
+    que ainda podem alcançá-lo (limitada pela maior altura entre os visuais). Assim,
+    visuais empilhados na mesma coluna, como os de largura total, não são
+    comparados todos entre si.
+
+    Args:
+        visuais (List[JsonDict]): Visuais com x, y, largura e altura
+
+    Returns:
+        List[Tuple[int, int]]: Índices dos pares sobrepostos, na ordem da lista
+    """
+    retangulos = [(_retangulo(v), i) for i, v in enumerate(visuais)
+                  if (v["largura"] or 0) > 0 and (v["altura"] or 0) > 0]
+    if not retangulos:
+        return []
+    retangulos.sort()
+    altura_maxima = max(y2 - y1 for (_, y1, _, y2), _ in retangulos)
+
+    pares = []
+    saidas: List[Tuple[float, int]] = []
+    # Visuais ativos como (y1, y2, índice), ordenados pela borda superior
+    ativos: List[Tuple[float, float, int]] = []
+    caixas: Dict[int, Tuple[float, float, int]] = {}
+    for (x1, y1, x2, y2), i in retangulos:
+        # Remove os que terminam antes (ou exatamente onde) este começa
+        while saidas and saidas[0][0] <= x1:
+            caixa = caixas.pop(heapq.heappop(saidas)[1])
+            del ativos[bisect.bisect_left(ativos, caixa)]
+        # Só quem começa acima de y2 e a menos de uma altura máxima de y1 pode sobrepor
+        inicio = bisect.bisect_right(ativos, (y1 - altura_maxima, float("inf")))
+        fim = bisect.bisect_left(ativos, (y2, float("-inf")))
+        for posicao in range(inicio, fim):
+            _, outro_y2, j = ativos[posicao]
+            if y1 < outro_y2:
+                pares.append((min(i, j), max(i, j)))
+        caixa = (y1, y2, i)
+        caixas[i] = caixa
+        bisect.insort(ativos, caixa)
+        heapq.heappush(saidas, (x2, i))
+    return sorted(pares)
+
+
+@registrar_regra("QA001", "Coluna calculada em tabela grande", "coluna", "aviso")
+def coluna_calculada_tabela_grande(coluna: JsonDict, contexto: JsonDict) -> Iterator[str]:
+    if coluna["objeto"].get("type") == "calculated" and coluna["tabela"]["grande"]:
+        yield ("Coluna calculada em tabela fato ou com muitas colunas; "
+               "prefira calcular na origem ou no Power Query")
+
+
+@registrar_regra("QA002", "Relacionamento bidirecional", "relacionamento", "aviso")
+def relacionamento_bidirecional(relacionamento: JsonDict, contexto: JsonDict) -> Iterator[str]:
+    if relacionamento["objeto"].get("crossFilteringBehavior") == "bothDirections":
+        yield "Filtro cruzado em ambas as direções; pode gerar ambiguidade e degradar o desempenho"
+
+
+@registrar_regra("QA003", "Medida sem formatação", "medida", "info")
+def medida_sem_formato(medida: JsonDict, contexto: JsonDict) -> Iterator[str]:
+    objeto = medida["objeto"]
+    if not objeto.get("formatString") and not objeto.get("formatStringDefinition"):
+        yield "Medida sem formatString definido"
+
+
+@registrar_regra("QA004", "Visual fora da página", "visual", "erro")
+def visual_fora_da_pagina(visual: JsonDict, contexto: JsonDict) -> Iterator[str]:
+    x1, y1, x2, y2 = _retangulo(visual["objeto"])
+    pagina = visual["pagina"]
+    if x1 < 0 or y1 < 0 or x2 > pagina["largura"] or y2 > pagina["altura"]:
+        yield (f"Posição ({int(x1)}, {int(y1)}) a ({int(x2)}, {int(y2)}) excede a página "
+               f"de {int(pagina['largura'])}x{int(pagina['altura'])}")
+
+
+@registrar_regra("QA005", "Visuais sobrepostos", "pagina", "aviso")
+def visuais_sobrepostos(pagina: JsonDict, contexto: JsonDict) -> Iterator[str]:
+    # Grupos e elementos decorativos ficam sobre outros visuais de propósito
+    visuais = [v for v in pagina["visuais"] if v["tipo"] and v["tipo"] not in TIPOS_DECORATIVOS]
+    for i, j in pares_sobrepostos(visuais):
+        yield f"{visuais[i]['nome']} ({visuais[i]['tipo']}) sobrepõe {visuais[j]['nome']} ({visuais[j]['tipo']})"
+
+
+def extrair_qualidade(achados: List[JsonDict]) -> str:
+    """Extrai e organiza os achados de qualidade em formato Markdown."""
+    contagem = {severidade: 0 for severidade in SEVERIDADES}
+    for achado in achados:
+        contagem[achado["severidade"]] += 1
+
+    markdown_output = [
+        "",
+        f"Achados: {len(achados)}\n"
+        + "".join(f"{severidade.capitalize()}: {total}\n" for severidade, total in contagem.items())
+        + SEPARADOR_REGISTRO
+    ]
+    ordem = {severidade: i for i, severidade in enumerate(SEVERIDADES)}
+    for achado in sorted(achados, key=lambda a: (ordem[a["severidade"]], a["regra"])):
+        markdown_output.append(
+            f"Regra: {achado['regra']} – {achado['descricao']}\n"
+            f"Severidade: {achado['severidade']}\n"
+            f"Objeto: {achado['tipo']} {achado['objeto']}\n"
+            f"Detalhe: {achado['mensagem']}\n"
+            + SEPARADOR_REGISTRO
+        )
+    return "\n".join(markdown_output)
+
+
+def salvar_qualidade_json(achados: List[JsonDict], caminho: str) -> str:
+    """Grava os achados de qualidade em JSON e retorna o caminho final."""
+    regras = [
+        {"codigo": regra["codigo"], "descricao": regra["descricao"],
+         "severidade": regra["severidade"], "objeto": tipo}
+        for tipo, lista in REGRAS.items() for regra in lista
+    ]
+    caminho_final = salvar_versao(caminho)
+    with open(caminho_final, 'w', encoding='utf-8') as f:
+        json.dump({"regras": regras, "achados": achados}, f, ensure_ascii=False, indent=2)
+    logger.info(f"Relatório de qualidade gravado em: {caminho_final}")
+    return caminho_final
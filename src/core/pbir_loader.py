@@ -0,0 +1,284 @@
+"""
+Leitura de projetos Power BI (.pbip) no formato PBIR
+----------------------------------------------------
+
+No formato PBIR cada página e cada visual do relatório fica em um arquivo próprio
+(`definition/pages/<pagina>/visuals/<visual>/visual.json`). Este módulo lê esses
+arquivos em paralelo e os converte para a mesma estrutura do `Report/Layout` de
+um `.pbit`, de modo que `extrair_paginas`, `extrair_visuais` e os demais
+consumidores funcionem sem alterações.
+
+Para relatórios grandes, o conteúdo já convertido é guardado em um cache em disco
+e reaproveitado para as pastas cujos arquivos não mudaram desde a última execução
+(mesmo mtime e tamanho).
+"""
+
+import os
+import json
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+
+from src.utils.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+JsonDict = Dict[str, Any]
+# Caminho do arquivo -> (mtime_ns, tamanho)
+Carimbo = Tuple[int, int]
+
+# Versão do formato do cache; incrementar quando a conversão mudar
+VERSAO_CACHE = 1
+
+
+def localizar_pasta_relatorio(arquivo_pbip: str) -> Path:
+    """
+    Localiza a pasta `.Report` de um projeto `.pbip`.
+
+    Args:
+        arquivo_pbip (str): Caminho do arquivo .pbip ou da própria pasta .Report
+
+    Returns:
+        Path: Caminho da pasta .Report
+
+    Raises:
+        FileNotFoundError: Se a pasta do relatório não for encontrada
+    """
+    caminho = Path(arquivo_pbip)
+    if caminho.is_dir():
+        return caminho
+
+    candidatos = []
+    try:
+        with open(caminho, 'r', encoding='utf-8-sig') as f:
+            projeto = json.load(f)
+        for artefato in projeto.get('artifacts', []):
+            pasta = artefato.get('report', {}).get('path')
+            if pasta:
+                candidatos.append(caminho.parent / pasta)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Não foi possível ler o arquivo .pbip ({e}); usando o nome padrão da pasta")
+    candidatos.append(caminho.parent / f"{caminho.stem}.Report")
+
+    for pasta in candidatos:
+        if pasta.is_dir():
+            return pasta
+    raise FileNotFoundError(f"Pasta do relatório não encontrada para: {arquivo_pbip}")
+
+
+def localizar_pasta_modelo(pasta_relatorio: Path) -> Optional[Path]:
+    """
+    Localiza a pasta `.SemanticModel` referenciada pelo relatório.
+
+    Args:
+        pasta_relatorio (Path): Caminho da pasta .Report
+
+    Returns:
+        Optional[Path]: Caminho da pasta .SemanticModel, ou None se o relatório
+            não referenciar um modelo local
+    """
+    try:
+        with open(pasta_relatorio / 'definition.pbir', 'r', encoding='utf-8-sig') as f:
+            referencia = json.load(f).get('datasetReference', {}).get('byPath', {}).get('path')
+        if referencia:
+            pasta = (pasta_relatorio / referencia).resolve()
+            if pasta.is_dir():
+                return pasta
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Não foi possível ler definition.pbir: {e}")
+
+    nome = pasta_relatorio.name[:-len('.Report')] if pasta_relatorio.name.endswith('.Report') else pasta_relatorio.name
+    pasta = pasta_relatorio.parent / f"{nome}.SemanticModel"
+    return pasta if pasta.is_dir() else None
+
+
+def _carimbo(entrada: os.DirEntry) -> Carimbo:
+    stat = entrada.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _listar_arquivos(pasta_paginas: Path) -> Dict[str, Carimbo]:
+    """Lista os arquivos page.json e visual.json com seus carimbos de modificação."""
+    arquivos: Dict[str, Carimbo] = {}
+    with os.scandir(pasta_paginas) as paginas:
+        for pagina in paginas:
+            if not pagina.is_dir():
+                continue
+            with os.scandir(pagina.path) as itens:
+                for item in itens:
+                    if item.name == 'page.json' and item.is_file():
+                        arquivos[item.path] = _carimbo(item)
+                    elif item.name == 'visuals' and item.is_dir():
+                        with os.scandir(item.path) as visuais:
+                            for visual in visuais:
+                                arquivo_visual = os.path.join(visual.path, 'visual.json')
+                                if visual.is_dir() and os.path.isfile(arquivo_visual):
+                                    stat = os.stat(arquivo_visual)
+                                    arquivos[arquivo_visual] = (stat.st_mtime_ns, stat.st_size)
+    return arquivos
+
+
+def _caminho_cache(pasta_relatorio: Path) -> Path:
+    chave = hashlib.sha1(str(pasta_relatorio.resolve()).encode('utf-8')).hexdigest()[:16]
+    return CACHE_DIR / f"pbir_{chave}.json"
+
+
+def _carregar_cache(caminho_cache: Path) -> Dict[str, Any]:
+    try:
+        with open(caminho_cache, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('versao') == VERSAO_CACHE:
+            return cache.get('arquivos', {})
+    except FileNotFoundError:
+        pass
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Cache PBIR inválido, será reconstruído: {e}")
+    return {}
+
+
+def _salvar_cache(caminho_cache: Path, arquivos: Dict[str, Any]) -> None:
+    try:
+        caminho_cache.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho_cache.with_suffix('.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'versao': VERSAO_CACHE, 'arquivos': arquivos}, f, ensure_ascii=False)
+        os.replace(temporario, caminho_cache)
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar o cache PBIR: {e}")
+
+
+def converter_visual(visual: JsonDict) -> JsonDict:
+    """
+    Converte um visual.json do PBIR para o formato de `config` do Report/Layout.
+
+    Args:
+        visual (JsonDict): Conteúdo do arquivo visual.json
+
+    Returns:
+        JsonDict: Configuração equivalente à de um visualContainer do Layout
+    """
+    config: JsonDict = {
+        "name": visual.get("name", ""),
+        "layouts": [{"id": 0, "position": visual.get("position", {})}],
+    }
+    definicao = visual.get("visual")
+    if definicao is not None:
+        query_state = definicao.get("query", {}).get("queryState", {})
+        config["singleVisual"] = {
+            "visualType": definicao.get("visualType"),
+            "projections": {
+                papel: [{"queryRef": p.get("queryRef")} for p in estado.get("projections", [])]
+                for papel, estado in query_state.items()
+            },
+        }
+    elif "visualGroup" in visual:
+        config["singleVisualGroup"] = visual["visualGroup"]
+    return config
+
+
+def _ler_arquivo(caminho: str) -> JsonDict:
+    """Lê e converte um page.json ou visual.json."""
+    with open(caminho, 'r', encoding='utf-8-sig') as f:
+        dados = json.load(f)
+    if os.path.basename(caminho) == 'visual.json':
+        return converter_visual(dados)
+    return dados
+
+
+def _montar_layout(pasta_paginas: Path, conteudos: Dict[str, JsonDict]) -> JsonDict:
+    """Agrupa páginas e visuais convertidos na estrutura do Report/Layout."""
+    paginas: Dict[str, JsonDict] = {}
+    for caminho, dados in conteudos.items():
+        partes = Path(caminho).relative_to(pasta_paginas).parts
+        pagina = paginas.setdefault(partes[0], {"name": partes[0], "visualContainers": []})
+        if partes[-1] == 'page.json':
+            pagina.update({
+                "name": dados.get("name", partes[0]),
+                "displayName": dados.get("displayName", partes[0]),
+                "width": dados.get("width"),
+                "height": dados.get("height"),
+            })
+        else:
+            position = dados["layouts"][0]["position"]
+            pagina["visualContainers"].append((partes[2], {
+                "x": position.get("x", 0),
+                "y": position.get("y", 0),
+                "z": position.get("z", 0),
+                "width": position.get("width", 0),
+                "height": position.get("height", 0),
+                "config": dados,
+            }))
+
+    ordem: List[str] = []
+    try:
+        with open(pasta_paginas / 'pages.json', 'r', encoding='utf-8-sig') as f:
+            ordem = json.load(f).get('pageOrder', [])
+    except (OSError, json.JSONDecodeError):
+        pass
+    posicao = {nome: i for i, nome in enumerate(ordem)}
+
+    sections = []
+    for pasta, pagina in sorted(paginas.items(), key=lambda item: (posicao.get(item[0], len(posicao)), item[0])):
+        pagina["visualContainers"] = [container for _, container in sorted(pagina["visualContainers"], key=lambda v: v[0])]
+        sections.append(pagina)
+    return {"sections": sections}
+
+
+def carregar_relatorio_pbir(arquivo_pbip: str, usar_cache: bool = True,
+                            max_workers: Optional[int] = None) -> JsonDict:
+    """
+    Carrega o relatório de um projeto `.pbip` na estrutura do Report/Layout.
+
+    Args:
+        arquivo_pbip (str): Caminho do arquivo .pbip ou da pasta .Report
+        usar_cache (bool, optional): Reaproveita arquivos não modificados desde a
+            última execução. Defaults to True
+        max_workers (Optional[int]): Número de threads de leitura. Defaults to None
+            (padrão do ThreadPoolExecutor)
+
+    Returns:
+        JsonDict: Dicionário com a chave "sections", como no Report/Layout
+
+    Raises:
+        FileNotFoundError: Se a pasta do relatório não for encontrada
+    """
+    pasta_relatorio = localizar_pasta_relatorio(arquivo_pbip)
+    pasta_paginas = pasta_relatorio / 'definition' / 'pages'
+
+    if not pasta_paginas.is_dir():
+        # Projetos salvos no formato PBIR-Legacy mantêm o layout em um único report.json
+        report_json = pasta_relatorio / 'report.json'
+        if not report_json.is_file():
+            raise FileNotFoundError(f"Definição do relatório não encontrada em: {pasta_relatorio}")
+        with open(report_json, 'r', encoding='utf-8-sig') as f:
+            logger.info(f"Relatório PBIR-Legacy carregado: {report_json}")
+            return json.load(f)
+
+    arquivos = _listar_arquivos(pasta_paginas)
+    caminho_cache = _caminho_cache(pasta_relatorio)
+    cache = _carregar_cache(caminho_cache) if usar_cache else {}
+
+    conteudos: Dict[str, JsonDict] = {}
+    pendentes = []
+    for caminho, carimbo in arquivos.items():
+        entrada = cache.get(caminho)
+        if entrada is not None and tuple(entrada[0]) == carimbo:
+            conteudos[caminho] = entrada[1]
+        else:
+            pendentes.append(caminho)
+
+    if pendentes:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for caminho, dados in zip(pendentes, executor.map(_ler_arquivo, pendentes)):
+                conteudos[caminho] = dados
+
+    logger.info(
+        f"Relatório PBIR carregado: {len(arquivos)} arquivos, "
+        f"{len(arquivos) - len(pendentes)} reaproveitados do cache"
+    )
+    if usar_cache and pendentes:
+        _salvar_cache(caminho_cache, {c: [list(arquivos[c]), conteudos[c]] for c in arquivos})
+
+    return _montar_layout(pasta_paginas, conteudos)
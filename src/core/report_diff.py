@@ -0,0 +1,263 @@
+"""
+Comparação semântica entre duas versões de um relatório Power BI
+----------------------------------------------------------------
+
+Carrega o modelo e o layout de duas versões (.pbit ou .pbip), identifica cada
+tabela, coluna, medida, partição, relacionamento e visual por uma chave estável
+(lineageTag quando existir, senão o nome qualificado) e compara os objetos pelo
+hash do seu conteúdo. Cada versão é percorrida uma única vez, e a comparação é
+feita por consulta em dicionário, em tempo linear no número de objetos.
+
+O resultado pode ser emitido como seção "Diferenças" da documentação ou em JSON.
+"""
+
+import os
+import json
+import marshal
+import logging
+import argparse
+from typing import Dict, Optional, Tuple
+
+from src.core.report_common import (
+    JsonDict,
+    SEPARADOR_REGISTRO,
+    criar_volume,
+    eh_tabela_auxiliar,
+    iterar_relacionamentos,
+    salvar_versao,
+)
+from src.core.report_loader import carregar_relatorio
+
+logger = logging.getLogger(__name__)
+
+# (tipo do objeto, chave estável) -> (hash do conteúdo, rótulo legível, objeto)
+Indice = Dict[Tuple[str, str], Tuple[int, str, JsonDict]]
+
+# Coleções aninhadas nas tabelas, comparadas como objetos próprios
+FILHOS_TABELA = ('columns', 'measures', 'partitions')
+
+
+
+def _hash(objeto: JsonDict) -> int:
+    """
+    Hash do conteúdo de um objeto JSON.
+
+    Os hashes só são comparados dentro do mesmo processo, então basta o hash nativo
+    da serialização com `marshal`, feita em C e bem mais barata que `repr` ou
+    `json.dumps` para objetos aninhados. Diferenças apenas na ordem das chaves são
+    descartadas em `comparar_indices`.
+    """
+    return hash(marshal.dumps(objeto))
+
+
+def indexar_objetos(layout_data: JsonDict, model_data: JsonDict) -> Indice:
+    """
+    Indexa os objetos do modelo e do layout pela sua chave estável.
+
+    Args:
+        layout_data (JsonDict): Layout do relatório
+        model_data (JsonDict): Modelo semântico
+
+    Returns:
+        Indice: Objetos indexados por (tipo, chave)
+    """
+    indice: Indice = {}
+
+    def adicionar(tipo: str, chave: str, rotulo: str, objeto: JsonDict) -> None:
+        indice[(tipo, chave)] = (_hash(objeto), rotulo, objeto)
+
+    for table in model_data.get('model', {}).get('tables', []):
+        table_name = table.get('name', '')
+        if eh_tabela_auxiliar(table_name):
+            continue
+        chave_tabela = table.get('lineageTag') or table_name
+        adicionar('Tabela', chave_tabela, table_name,
+                  {k: v for k, v in table.items() if k not in FILHOS_TABELA})
+        for column in table.get('columns', []):
+            nome = column.get('name', '')
+            adicionar('Coluna', column.get('lineageTag') or f"{chave_tabela}/{nome}", f"{table_name}[{nome}]", column)
+        for measure in table.get('measures', []):
+            nome = measure.get('name', '')
+            adicionar('Medida', measure.get('lineageTag') or f"{chave_tabela}/{nome}", f"{table_name}[{nome}]", measure)
+        for partition in table.get('partitions', []):
+            nome = partition.get('name', '')
+            adicionar('Partição', f"{chave_tabela}/{nome}", f"{table_name}/{nome}", partition)
+
+    for relation, rotulo in iterar_relacionamentos(model_data):
+        adicionar('Relacionamento', relation.get('name') or rotulo, rotulo, relation)
+
+    for section in layout_data.get('sections', []):
+        page_key = section.get('name') or section.get('displayName', '')
+        page_name = section.get('displayName', page_key)
+        adicionar('Página', page_key, page_name, {k: v for k, v in section.items() if k != 'visualContainers'})
+        for posicao, container in enumerate(section.get('visualContainers', [])):
+            config = container.get('config', '{}')
+            try:
+                # No .pbit o config é uma string JSON; no PBIR já vem decodificado
+                config_data = json.loads(config) if isinstance(config, str) else config
+            except json.JSONDecodeError:
+                config_data = {}
+            nome = config_data.get('name')
+            tipo_visual = config_data.get('singleVisual', {}).get('visualType')
+            nome = nome or str(posicao)
+            tipo_visual = tipo_visual or 'grupo'
+
+            adicionar('Visual', f"{page_key}/{nome}", f"{page_name}/{nome} ({tipo_visual})", container)
+
+    return indice
+
+
+def comparar_indices(anterior: Indice, atual: Indice) -> JsonDict:
+    """
+    Compara dois índices de objetos.
+
+    Args:
+        anterior (Indice): Objetos da versão anterior
+        atual (Indice): Objetos da versão atual
+
+    Returns:
+        JsonDict: Listas "adicionados", "removidos" e "modificados" e o "resumo"
+    """
+    adicionados, removidos, modificados = [], [], []
+    for (tipo, chave), (digest, rotulo, objeto) in atual.items():
+        entrada = anterior.get((tipo, chave))
+        if entrada is None:
+            adicionados.append({'tipo': tipo, 'objeto': rotulo})
+        elif entrada[0] != digest:
+            antigo = entrada[2]
+            campos = sorted(k for k in set(antigo) | set(objeto) if antigo.get(k) != objeto.get(k))
+            if not campos:
+                # Mesmo conteúdo com chaves em outra ordem
+                continue
+            item = {'tipo': tipo, 'objeto': rotulo, 'campos': campos}
+            if entrada[1] != rotulo:
+                item['antes'] = entrada[1]
+            modificados.append(item)
+    for (tipo, chave), (_, rotulo, _) in anterior.items():
+        if (tipo, chave) not in atual:
+            removidos.append({'tipo': tipo, 'objeto': rotulo})
+
+    return {
+        'resumo': {
+            'adicionados': len(adicionados),
+            'removidos': len(removidos),
+            'modificados': len(modificados),
+        },
+        'adicionados': adicionados,
+        'removidos': removidos,
+        'modificados': modificados,
+    }
+
+
+def comparar_com_anterior(arquivo_anterior: str, layout_data: JsonDict, model_data: JsonDict,
+                          arquivo_atual: str = '') -> Optional[JsonDict]:
+    """
+    Compara uma versão já carregada com uma versão anterior em disco.
+
+    Args:
+        arquivo_anterior (str): Caminho da versão anterior (.pbit ou .pbip)
+        layout_data (JsonDict): Layout da versão atual
+        model_data (JsonDict): Modelo semântico da versão atual
+        arquivo_atual (str, optional): Caminho da versão atual, apenas para o relatório
+
+    Returns:
+        Optional[JsonDict]: Resultado de `comparar_indices`, ou None se a versão
+            anterior não puder ser carregada
+    """
+    dados = carregar_relatorio(arquivo_anterior)
+    if dados is None:
+        logger.error(f"Não foi possível carregar a versão: {arquivo_anterior}")
+        return None
+
+    diff = comparar_indices(indexar_objetos(*dados), indexar_objetos(layout_data, model_data))
+    diff['anterior'] = arquivo_anterior
+    diff['atual'] = arquivo_atual
+    logger.info(f"Comparação concluída: {diff['resumo']}")
+    return diff
+
+
+def comparar_relatorios(arquivo_anterior: str, arquivo_atual: str) -> Optional[JsonDict]:
+    """
+    Carrega duas versões de um relatório e compara seus objetos.
+
+    Args:
+        arquivo_anterior (str): Caminho da versão anterior (.pbit ou .pbip)
+        arquivo_atual (str): Caminho da versão atual (.pbit ou .pbip)
+
+    Returns:
+        Optional[JsonDict]: Resultado de `comparar_indices`, ou None se alguma
+            das versões não puder ser carregada
+    """
+    dados = carregar_relatorio(arquivo_atual)
+    if dados is None:
+        logger.error(f"Não foi possível carregar a versão: {arquivo_atual}")
+        return None
+    return comparar_com_anterior(arquivo_anterior, *dados, arquivo_atual=arquivo_atual)
+
+
+def extrair_diferencas(diff: JsonDict) -> str:
+    """Extrai e organiza as diferenças entre versões em formato Markdown."""
+    resumo = diff['resumo']
+    markdown_output = [
+        "",
+        f"Versão anterior: {diff.get('anterior', '')}\n"
+        f"Versão atual: {diff.get('atual', '')}\n"
+        f"Adicionados: {resumo['adicionados']}\n"
+        f"Removidos: {resumo['removidos']}\n"
+        f"Modificados: {resumo['modificados']}\n"
+        + SEPARADOR_REGISTRO
+    ]
+    for item in diff['adicionados']:
+        markdown_output.append(f"Adicionado: {item['tipo']} {item['objeto']}\n" + SEPARADOR_REGISTRO)
+    for item in diff['removidos']:
+        markdown_output.append(f"Removido: {item['tipo']} {item['objeto']}\n" + SEPARADOR_REGISTRO)
+    for item in diff['modificados']:
+        antes = f"Nome anterior: {item['antes']}\n" if 'antes' in item else ""
+        markdown_output.append(
+            f"Modificado: {item['tipo']} {item['objeto']}\n"
+            f"{antes}"
+            f"Campos alterados: {', '.join(item['campos'])}\n"
+            + SEPARADOR_REGISTRO
+        )
+    return "\n".join(markdown_output)
+
+
+def salvar_diff_json(diff: JsonDict, caminho: str) -> str:
+    """Grava o resultado da comparação em JSON e retorna o caminho final."""
+    caminho_final = salvar_versao(caminho)
+    with open(caminho_final, 'w', encoding='utf-8') as f:
+        json.dump(diff, f, ensure_ascii=False, indent=2)
+    logger.info(f"Diferenças gravadas em: {caminho_final}")
+    return caminho_final
+
+
+def salvar_diff_docx(diff: JsonDict, modelo_word: str, caminho: str, nome_BI: str) -> str:
+    """Grava o resultado da comparação como documento Word e retorna o caminho final."""
+    document = criar_volume(modelo_word, nome_BI, "Diferenças")
+    document.add_paragraph(extrair_diferencas(diff))
+    caminho_final = salvar_versao(caminho)
+    document.save(caminho_final)
+    logger.info(f"Diferenças gravadas em: {caminho_final}")
+    return caminho_final
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara duas versões de um relatório Power BI (.pbit ou .pbip)")
+    parser.add_argument("anterior", help="Versão anterior do relatório")
+    parser.add_argument("atual", help="Versão atual do relatório")
+    parser.add_argument("--json", metavar="CAMINHO", help="Grava o resultado em JSON")
+    parser.add_argument("--modelo", metavar="MODELO", help="Modelo Word para gravar o resultado em .docx")
+    parser.add_argument("--saida", metavar="DIR", default=".", help="Diretório do documento .docx")
+    args = parser.parse_args()
+
+    resultado = comparar_relatorios(args.anterior, args.atual)
+    if resultado is None:
+        raise SystemExit(1)
+    if args.json:
+        salvar_diff_json(resultado, args.json)
+    if args.modelo:
+        nome = os.path.splitext(os.path.basename(args.atual))[0]
+        os.makedirs(args.saida, exist_ok=True)
+        salvar_diff_docx(resultado, args.modelo, os.path.join(args.saida, f"{nome}_diferencas.docx"), nome)
+    if not args.json and not args.modelo:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
@@ -0,0 +1,234 @@
+"""
+Carregamento de relatórios Power BI
+-----------------------------------
+
+Lê o layout e o modelo semântico de um arquivo `.pbit` (renomeado para `.zip` e
+extraído) ou de um projeto `.pbip` (relatório PBIR e modelo em model.bim ou TMDL).
+"""
+
+import json
+import os
+import zipfile
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.core.pbir_loader import carregar_relatorio_pbir, localizar_pasta_modelo, localizar_pasta_relatorio
+from src.core.report_common import JsonDict
+from src.core.tmdl_parser import carregar_modelo_tmdl
+
+logger = logging.getLogger(__name__)
+
+
+# Função para verificar e renomear arquivos
+def verificar_ou_renomear_arquivo(arquivo_pbit: str, arquivo_zip: str) -> bool:
+    """
+    Verifica a existência do arquivo zip e renomeia o arquivo .pbit se necessário.
+    
+    Args:
+        arquivo_pbit (str): Caminho do arquivo .pbit
+        arquivo_zip (str): Caminho do arquivo .zip desejado
+        
+    Returns:
+        bool: True se o processo foi bem sucedido, False caso contrário
+        
+    Raises:
+        FileNotFoundError: Se o arquivo .pbit não existir
+        PermissionError: Se não houver permissão para renomear o arquivo
+    """
+    try:
+        if os.path.exists(arquivo_zip):
+            logger.info(f"Arquivo zip já existe em: {arquivo_zip}")
+            return True
+            
+        if not os.path.exists(arquivo_pbit):
+            raise FileNotFoundError(f"Arquivo .pbit não encontrado: {arquivo_pbit}")
+            
+        os.rename(arquivo_pbit, arquivo_zip)
+        logger.info(f"Arquivo renomeado com sucesso: {arquivo_pbit} -> {arquivo_zip}")
+        return True
+        
+    except PermissionError as e:
+        logger.error(f"Erro de permissão ao renomear arquivo: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Erro inesperado ao processar arquivo: {e}")
+        return False
+
+
+# Função para extrair arquivos do ZIP
+def extrair_arquivos_zip(arquivo_zip: str, caminho_BI: str, arquivos_para_extrair: List[str]) -> bool:
+    """
+    Extrai arquivos específicos de um arquivo ZIP.
+    
+    Args:
+        arquivo_zip (str): Caminho do arquivo ZIP
+        caminho_BI (str): Diretório onde os arquivos serão extraídos
+        arquivos_para_extrair (List[str]): Lista de arquivos a serem extraídos
+        
+    Returns:
+        bool: True se todos os arquivos foram extraídos com sucesso, False caso contrário
+        
+    Raises:
+        FileNotFoundError: Se o arquivo ZIP não existir
+        zipfile.BadZipFile: Se o arquivo ZIP estiver corrompido
+    """
+    try:
+        if not os.path.exists(arquivo_zip):
+            raise FileNotFoundError(f"Arquivo ZIP não encontrado: {arquivo_zip}")
+            
+        with zipfile.ZipFile(arquivo_zip, 'r') as zip_ref:
+            # Verifica se todos os arquivos existem no ZIP
+            zip_files = zip_ref.namelist()
+            for arquivo in arquivos_para_extrair:
+                if arquivo not in zip_files:
+                    raise KeyError(f"Arquivo não encontrado no ZIP: {arquivo}")
+            
+            # Extrai os arquivos
+            for arquivo in arquivos_para_extrair:
+                zip_ref.extract(arquivo, caminho_BI)
+                logger.info(f"Arquivo extraído com sucesso: {arquivo}")
+                
+        logger.info(f"Todos os arquivos foram extraídos com sucesso para: {caminho_BI}")
+        return True
+        
+    except zipfile.BadZipFile as e:
+        logger.error(f"Arquivo ZIP corrompido: {e}")
+        return False
+    except KeyError as e:
+        logger.error(f"Arquivo não encontrado no ZIP: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Erro inesperado ao extrair arquivos: {e}")
+        return False
+
+
+# Função para carregar os dados do JSON
+def carregar_dados_json(arquivo: str, encoding: str = 'utf-16-le') -> JsonDict:
+    """
+    Carrega dados de um arquivo JSON com tratamento de erros.
+    
+    Args:
+        arquivo (str): Caminho do arquivo JSON a ser carregado
+        encoding (str, optional): Codificação do arquivo. Defaults to 'utf-16-le'
+        
+    Returns:
+        JsonDict: Dicionário com os dados do JSON ou dicionário vazio em caso de erro
+        
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+        json.JSONDecodeError: Se o arquivo não for um JSON válido
+    """
+    try:
+        if not os.path.exists(arquivo):
+            raise FileNotFoundError(f"Arquivo não encontrado: {arquivo}")
+            
+        with open(arquivo, 'r', encoding=encoding) as f:
+            dados = json.load(f)
+            logger.info(f"Arquivo JSON carregado com sucesso: {arquivo}")
+            return dados
+            
+    except FileNotFoundError as e:
+        logger.error(f"Arquivo não encontrado: {e}")
+        raise
+    except json.JSONDecodeError as e:
+        logger.error(f"Erro ao decodificar JSON: {e}")
+        return {}
+    except UnicodeDecodeError as e:
+        logger.error(f"Erro de codificação ao ler arquivo: {e}")
+        # Tenta com outra codificação
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+                logger.info(f"Arquivo JSON carregado com sucesso usando UTF-8: {arquivo}")
+                return dados
+        except Exception as e2:
+            logger.error(f"Falha ao tentar codificação alternativa: {e2}")
+            return {}
+    except Exception as e:
+        logger.error(f"Erro inesperado ao carregar JSON: {e}")
+        return {}
+
+
+def carregar_pbit(arquivo_pbit: str) -> Optional[Tuple[JsonDict, JsonDict]]:
+    """
+    Carrega o layout e o modelo de um arquivo .pbit.
+    
+    Args:
+        arquivo_pbit (str): Caminho completo para o arquivo .pbit
+        
+    Returns:
+        Optional[Tuple[JsonDict, JsonDict]]: (layout, modelo), ou None em caso de erro
+    """
+    nome_BI = Path(arquivo_pbit).stem
+    caminho_BI = str(Path(arquivo_pbit).parent)
+    arquivo_zip = os.path.join(caminho_BI, f'{nome_BI}.zip')
+    
+    # Verifica e renomeia o arquivo para .zip, se necessário
+    if not verificar_ou_renomear_arquivo(arquivo_pbit, arquivo_zip):
+        logger.error("Falha ao verificar ou renomear o arquivo.")
+        return None
+    
+    # Extrai arquivos do ZIP
+    if not extrair_arquivos_zip(arquivo_zip, caminho_BI, ['Report/Layout', 'DataModelSchema']):
+        logger.error("Falha ao extrair arquivos do ZIP.")
+        return None
+    
+    # Carrega os dados JSON
+    try:
+        layout_data = carregar_dados_json(os.path.join(caminho_BI, 'Report/Layout'))
+        model_data = carregar_dados_json(os.path.join(caminho_BI, 'DataModelSchema'))
+    except FileNotFoundError as e:
+        logger.error(f"Arquivo JSON não encontrado: {e}")
+        return None
+    
+    # Reverte o arquivo ZIP para o formato original .pbit
+    try:
+        os.rename(arquivo_zip, arquivo_pbit)
+        logger.info("Arquivo ZIP revertido para .pbit com sucesso")
+    except Exception as e:
+        logger.error(f"Erro ao reverter arquivo ZIP para .pbit: {e}")
+        return None
+    
+    return layout_data, model_data
+
+
+def carregar_pbip(arquivo_pbip: str) -> Optional[Tuple[JsonDict, JsonDict]]:
+    """
+    Carrega o layout e o modelo de um projeto .pbip (formato PBIR).
+    
+    Args:
+        arquivo_pbip (str): Caminho do arquivo .pbip ou da pasta .Report
+        
+    Returns:
+        Optional[Tuple[JsonDict, JsonDict]]: (layout, modelo), ou None em caso de erro
+    """
+    try:
+        layout_data = carregar_relatorio_pbir(arquivo_pbip)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.error(f"Erro ao carregar relatório PBIR: {e}")
+        return None
+    
+    model_data: JsonDict = {}
+    pasta_modelo = localizar_pasta_modelo(localizar_pasta_relatorio(arquivo_pbip))
+    if pasta_modelo is None:
+        logger.warning("Modelo semântico local não encontrado; seções do modelo ficarão vazias")
+    elif (pasta_modelo / 'model.bim').exists():
+        model_data = carregar_dados_json(str(pasta_modelo / 'model.bim'), encoding='utf-8-sig')
+    elif (pasta_modelo / 'definition').is_dir():
+        try:
+            model_data = carregar_modelo_tmdl(str(pasta_modelo))
+        except (FileNotFoundError, UnicodeDecodeError) as e:
+            logger.error(f"Erro ao carregar modelo TMDL: {e}")
+            return None
+    else:
+        logger.warning(f"Modelo semântico em formato não suportado: {pasta_modelo}")
+    
+    return layout_data, model_data
+
+
+def carregar_relatorio(arquivo: str) -> Optional[Tuple[JsonDict, JsonDict]]:
+    """Carrega layout e modelo de um .pbit ou de um projeto .pbip, conforme a extensão."""
+    if arquivo.lower().endswith('.pbip') or os.path.isdir(arquivo):
+        return carregar_pbip(arquivo)
+    return carregar_pbit(arquivo)
@@ -3,7 +3,7 @@ Automação para Geração de Documentação de Projetos Power BI
 -----------------------------------------------------------
 
 Este código automatiza a documentação de relatórios Power BI a partir de um arquivo `.pbit` 
-convertido em `.zip`. Ele extrai informações de páginas, tabelas, colunas, medidas, fontes, 
+convertido em `.zip` ou de um projeto `.pbip`. Ele extrai informações de páginas, tabelas, colunas, medidas, fontes, 
 e relacionamentos para gerar uma documentação detalhada em Word.
 """
 
@@ -19,9 +19,33 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from io import StringIO
 import time
 import logging
-from typing import Dict, List, Optional, Union, Any
+import argparse
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
 from pathlib import Path
 
+# Definições e carregamento compartilhados com os módulos de estatísticas, recursos,
+# qualidade e comparação; reexportados aqui para manter a interface deste módulo
+from src.core.report_common import (
+    SEPARADOR_REGISTRO,
+    JsonDict,
+    VisualConfig,
+    carregar_modelo_word,
+    criar_volume,
+    eh_tabela_auxiliar,
+    iterar_relacionamentos,
+    iterar_visuais,
+    juntar_expressao,
+    salvar_versao,
+)
+from src.core.report_loader import (
+    carregar_dados_json,
+    carregar_pbip,
+    carregar_pbit,
+    carregar_relatorio,
+    extrair_arquivos_zip,
+    verificar_ou_renomear_arquivo,
+)
+
 # Configuração do logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,136 +58,15 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Tipos customizados para melhor type hinting
-JsonDict = Dict[str, Any]
-VisualConfig = Dict[str, Any]
-
-# Função para verificar e renomear arquivos
-def verificar_ou_renomear_arquivo(arquivo_pbit: str, arquivo_zip: str) -> bool:
-    """
-    Verifica a existência do arquivo zip e renomeia o arquivo .pbit se necessário.
-    
-    Args:
-        arquivo_pbit (str): Caminho do arquivo .pbit
-        arquivo_zip (str): Caminho do arquivo .zip desejado
-        
-    Returns:
-        bool: True se o processo foi bem sucedido, False caso contrário
-        
-    Raises:
-        FileNotFoundError: Se o arquivo .pbit não existir
-        PermissionError: Se não houver permissão para renomear o arquivo
-    """
-    try:
-        if os.path.exists(arquivo_zip):
-            logger.info(f"Arquivo zip já existe em: {arquivo_zip}")
-            return True
-            
-        if not os.path.exists(arquivo_pbit):
-            raise FileNotFoundError(f"Arquivo .pbit não encontrado: {arquivo_pbit}")
-            
-        os.rename(arquivo_pbit, arquivo_zip)
-        logger.info(f"Arquivo renomeado com sucesso: {arquivo_pbit} -> {arquivo_zip}")
-        return True
-        
-    except PermissionError as e:
-        logger.error(f"Erro de permissão ao renomear arquivo: {e}")
-        raise
-    except Exception as e:
-        logger.error(f"Erro inesperado ao processar arquivo: {e}")
-        return False
-
-# Função para extrair arquivos do ZIP
-def extrair_arquivos_zip(arquivo_zip: str, caminho_BI: str, arquivos_para_extrair: List[str]) -> bool:
-    """
-    Extrai arquivos específicos de um arquivo ZIP.
-    
-    Args:
-        arquivo_zip (str): Caminho do arquivo ZIP
-        caminho_BI (str): Diretório onde os arquivos serão extraídos
-        arquivos_para_extrair (List[str]): Lista de arquivos a serem extraídos
-        
-    Returns:
-        bool: True se todos os arquivos foram extraídos com sucesso, False caso contrário
-        
-    Raises:
-        FileNotFoundError: Se o arquivo ZIP não existir
-        zipfile.BadZipFile: Se o arquivo ZIP estiver corrompido
-    """
-    try:
-        if not os.path.exists(arquivo_zip):
-            raise FileNotFoundError(f"Arquivo ZIP não encontrado: {arquivo_zip}")
-            
-        with zipfile.ZipFile(arquivo_zip, 'r') as zip_ref:
-            # Verifica se todos os arquivos existem no ZIP
-            zip_files = zip_ref.namelist()
-            for arquivo in arquivos_para_extrair:
-                if arquivo not in zip_files:
-                    raise KeyError(f"Arquivo não encontrado no ZIP: {arquivo}")
-            
-            # Extrai os arquivos
-            for arquivo in arquivos_para_extrair:
-                zip_ref.extract(arquivo, caminho_BI)
-                logger.info(f"Arquivo extraído com sucesso: {arquivo}")
-                
-        logger.info(f"Todos os arquivos foram extraídos com sucesso para: {caminho_BI}")
-        return True
-        
-    except zipfile.BadZipFile as e:
-        logger.error(f"Arquivo ZIP corrompido: {e}")
-        return False
-    except KeyError as e:
-        logger.error(f"Arquivo não encontrado no ZIP: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"Erro inesperado ao extrair arquivos: {e}")
-        return False
+# Conteúdo de uma seção: texto Markdown ou lista de blocos de texto e de imagem ({"imagem": caminho})
+Conteudo = Union[str, List[Any]]
+# Uma seção pode ser o conteúdo já pronto ou um produtor avaliado sob demanda
+Secao = Union[Conteudo, Callable[[], Conteudo]]
 
-# Função para carregar os dados do JSON
-def carregar_dados_json(arquivo: str, encoding: str = 'utf-16-le') -> JsonDict:
-    """
-    Carrega dados de um arquivo JSON com tratamento de erros.
-    
-    Args:
-        arquivo (str): Caminho do arquivo JSON a ser carregado
-        encoding (str, optional): Codificação do arquivo. Defaults to 'utf-16-le'
-        
-    Returns:
-        JsonDict: Dicionário com os dados do JSON ou dicionário vazio em caso de erro
-        
-    Raises:
-        FileNotFoundError: Se o arquivo não existir
-        json.JSONDecodeError: Se o arquivo não for um JSON válido
-    """
-    try:
-        if not os.path.exists(arquivo):
-            raise FileNotFoundError(f"Arquivo não encontrado: {arquivo}")
-            
-        with open(arquivo, 'r', encoding=encoding) as f:
-            dados = json.load(f)
-            logger.info(f"Arquivo JSON carregado com sucesso: {arquivo}")
-            return dados
-            
-    except FileNotFoundError as e:
-        logger.error(f"Arquivo não encontrado: {e}")
-        raise
-    except json.JSONDecodeError as e:
-        logger.error(f"Erro ao decodificar JSON: {e}")
-        return {}
-    except UnicodeDecodeError as e:
-        logger.error(f"Erro de codificação ao ler arquivo: {e}")
-        # Tenta com outra codificação
-        try:
-            with open(arquivo, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-                logger.info(f"Arquivo JSON carregado com sucesso usando UTF-8: {arquivo}")
-                return dados
-        except Exception as e2:
-            logger.error(f"Falha ao tentar codificação alternativa: {e2}")
-            return {}
-    except Exception as e:
-        logger.error(f"Erro inesperado ao carregar JSON: {e}")
-        return {}
+# Títulos das seções na ordem em que aparecem no modelo padrão
+SECOES = ["Páginas", "Tabelas", "Medidas", "Visuais", "Fontes", "Relacionamentos"]
+# Seções que não constam do modelo padrão e só são geradas quando pedidas
+SECOES_OPCIONAIS = ["Estatísticas", "Recursos", "Qualidade"]
 
 # Função para extrair as páginas do arquivo "Layout"
 def extrair_paginas(layout: dict) -> str:
@@ -178,25 +81,18 @@ def extrair_paginas(layout: dict) -> str:
 def extrair_visuais(layout: dict) -> str:
     """Extrai e organiza informações de visuais em cada página em formato Markdown."""
     markdown_output = [""]
-    for section in layout.get('sections', []):
-        page_name = section.get('displayName', 'Sem Nome')
-        for container in section.get("visualContainers", []):
-            config_data = json.loads(container.get("config", "{}"))
-            visual_type = config_data.get("singleVisual", {}).get("visualType")
-            position = next(iter(config_data.get("layouts", [])), {}).get("position", {})
-            query_refs = [item.get("queryRef") for items in config_data.get("singleVisual", {}).get("projections", {}).values()
-                          for item in items if item.get("queryRef")]
-            
-            markdown_output.append(
-                f"Página: {page_name}\n"
-                f"X: {int(position.get('x', 0))}\n"
-                f"Y: {int(position.get('y', 0))}\n"
-                f"Altura: {int(position.get('height', 0))}\n"
-                f"Largura: {int(position.get('width', 0))}\n"
-                f"Tipo de visual: {visual_type}\n"
-                f"Medidas utilizadas: {', '.join(query_refs) if query_refs else 'Não há medidas utilizadas no visual'}\n"
-                "-----------\n"
-            )
+    for visual in iterar_visuais(layout):
+        query_refs = visual["campos"]
+        markdown_output.append(
+            f"Página: {visual['pagina']}\n"
+            f"X: {int(visual['x'])}\n"
+            f"Y: {int(visual['y'])}\n"
+            f"Altura: {int(visual['altura'])}\n"
+            f"Largura: {int(visual['largura'])}\n"
+            f"Tipo de visual: {visual['tipo']}\n"
+            f"Medidas utilizadas: {', '.join(query_refs) if query_refs else 'Não há medidas utilizadas no visual'}\n"
+            "-----------\n"
+        )
     return "\n".join(markdown_output)
 
 def extrair_tabelas(model_data: dict) -> str:
@@ -204,7 +100,7 @@ def extrair_tabelas(model_data: dict) -> str:
     markdown_output = [""]
     for table in model_data.get('model', {}).get('tables', []):
         table_name = table.get("name", "")
-        if table_name.startswith("DateTableTemplate") or table_name.startswith("LocalDateTable"):
+        if eh_tabela_auxiliar(table_name):
             continue
         for column in table.get('columns', []):
             column_name = column.get("name", "")
@@ -231,8 +127,7 @@ def extrair_medidas(model_data: dict) -> str:
             if (table_name, measure_name) in processed_measures:
                 continue
             processed_measures.add((table_name, measure_name))
-            if isinstance(measure_expression, list):
-                measure_expression = ' '.join(filter(lambda x: x.strip(), measure_expression))
+            measure_expression = juntar_expressao(measure_expression)
             markdown_output.append(
                 f"Tabela: {table_name}\n"
                 f"Medida: {measure_name}\n"
@@ -246,15 +141,14 @@ def extrair_fontes(model_data: dict) -> str:
     markdown_output = [""]
     for table in model_data.get('model', {}).get('tables', []):
         table_name = table.get("name", "")
-        if table_name.startswith("DateTableTemplate") or table_name.startswith("LocalDateTable"):
+        if eh_tabela_auxiliar(table_name):
             continue
         for partition in table.get('partitions', []):
             partition_mode = partition.get('mode')
             source = partition.get('source', {})
             font_type = source.get('type')
             font_expression = source.get('expression')
-            if isinstance(font_expression, list):
-                font_expression = ' '.join(filter(lambda x: x.strip(), font_expression))
+            font_expression = juntar_expressao(font_expression)
             markdown_output.append(
                 f"Tabela: {table_name}\n"
                 f"Modo de importação: {partition_mode}\n"
@@ -267,19 +161,12 @@ def extrair_fontes(model_data: dict) -> str:
 def extrair_relacionamentos(model_data: dict) -> str:
     """Extrai e organiza informações de relacionamentos em formato Markdown."""
     markdown_output = [""]
-    for relation in model_data.get('model', {}).get('relationships', []):
-        from_table = relation.get('fromTable')
-        to_table = relation.get('toTable')
-        from_column = relation.get('fromColumn', '')
-        to_column = relation.get('toColumn', '')
-        if from_table.startswith("DateTableTemplate") or from_table.startswith("LocalDateTable") or \
-           to_table.startswith("DateTableTemplate") or to_table.startswith("LocalDateTable"):
-            continue
+    for relation, _ in iterar_relacionamentos(model_data):
         markdown_output.append(
-            f"Da tabela: {from_table}\n"
-            f"Para tabela: {to_table}\n"
-            f"Da coluna: {from_column}\n"
-            f"Para coluna: {to_column}\n"
+            f"Da tabela: {relation.get('fromTable')}\n"
+            f"Para tabela: {relation.get('toTable')}\n"
+            f"Da coluna: {relation.get('fromColumn', '')}\n"
+            f"Para coluna: {relation.get('toColumn', '')}\n"
             "-----------\n"
         )
     return "\n".join(markdown_output)
@@ -289,55 +176,215 @@ Segunda parte do código:
 1. Exportação para o Word das informações em Markdown
 """
 
-def salvar_versao(salvar_path):
+def carregar_dataframes(layout_data: JsonDict, model_data: JsonDict) -> Callable[[], Dict[str, Any]]:
     """
-    Verifica se o arquivo já existe e, se sim, cria um nome de arquivo com uma versão incremental.
+    Cria um produtor memoizado dos DataFrames do catálogo.
     
-    Parâmetros:
-        salvar_path (str): Caminho completo do arquivo que deseja salvar.
-        
-    Retorna:
-        str: Caminho final do arquivo com uma versão incrementada, se necessário.
+    O pandas só é importado e os DataFrames só são montados na primeira chamada,
+    que é compartilhada entre a seção de estatísticas e a exportação do catálogo.
     """
+    cache: Dict[str, Any] = {}
+
+    def obter() -> Dict[str, Any]:
+        if "frames" not in cache:
+            from src.core.model_dataframes import criar_dataframes
+            cache["frames"] = criar_dataframes(model_data, layout_data)
+        return cache["frames"]
+
+    return obter
 
-    # Se o arquivo não existir, retorna o caminho original
-    if not os.path.exists(salvar_path):
-        return salvar_path
+def carregar_achados(layout_data: JsonDict, model_data: JsonDict) -> Callable[[], List[JsonDict]]:
+    """
+    Cria um produtor memoizado dos achados de qualidade.
     
-    # Se já existir, adiciona a versão incremental
-    base, ext = os.path.splitext(salvar_path)
-    versao = 2
+    As regras só são executadas na primeira chamada, compartilhada entre a seção
+    "Qualidade" e o relatório em JSON.
+    """
+    cache: Dict[str, Any] = {}
+
+    def obter() -> List[JsonDict]:
+        if "achados" not in cache:
+            from src.core.model_lint import executar_regras
+            cache["achados"] = executar_regras(layout_data, model_data)
+        return cache["achados"]
+
+    return obter
+
+def _secao_qualidade(obter_achados: Callable[[], List[JsonDict]]) -> str:
+    """Produz a seção de qualidade a partir dos achados das regras."""
+    from src.core.model_lint import extrair_qualidade
+    return extrair_qualidade(obter_achados())
+
+def _secao_estatisticas(obter_frames: Callable[[], Dict[str, Any]]) -> str:
+    """Produz a seção de estatísticas a partir dos DataFrames do catálogo."""
+    from src.core.model_dataframes import extrair_estatisticas
+    return extrair_estatisticas(obter_frames())
+
+def _secao_diferencas(arquivo_anterior: str, layout_data: JsonDict, model_data: JsonDict,
+                      arquivo_atual: str) -> str:
+    """Produz a seção de diferenças em relação a uma versão anterior do relatório."""
+    from src.core.report_diff import comparar_com_anterior, extrair_diferencas
+    diff = comparar_com_anterior(arquivo_anterior, layout_data, model_data, arquivo_atual)
+    if diff is None:
+        return f"\nNão foi possível carregar a versão anterior: {arquivo_anterior}\n"
+    return extrair_diferencas(diff)
+
+def _secao_recursos(arquivo: str, layout_data: JsonDict) -> Conteudo:
+    """Produz a seção de recursos estáticos (imagens e temas) do relatório."""
+    from src.core.static_resources import extrair_recursos
+    return extrair_recursos(arquivo, layout_data)
+
+def criar_extracoes(layout_data: JsonDict, model_data: JsonDict,
+                    obter_frames: Optional[Callable[[], Dict[str, Any]]] = None,
+                    arquivo: Optional[str] = None,
+                    obter_achados: Optional[Callable[[], List[JsonDict]]] = None) -> Dict[str, Callable[[], Conteudo]]:
+    """
+    Monta o dicionário de seções com produtores preguiçosos.
     
-    # Incrementa a versão até encontrar um nome de arquivo disponível
-    while os.path.exists(f"{base}_versão_{versao:02}{ext}"):
-        versao += 1
+    Nenhuma extração é executada aqui: cada produtor só é chamado por
+    `gerar_documento` quando o modelo Word possui o título correspondente
+    ou quando a seção foi pedida explicitamente.
     
-    # Retorna o novo caminho do arquivo com a versão adicionada
-    return f"{base}_versão_{versao:02}{ext}"
+    Args:
+        layout_data (JsonDict): Conteúdo do arquivo Report/Layout
+        model_data (JsonDict): Conteúdo do arquivo DataModelSchema
+        obter_frames (Optional[Callable]): Produtor dos DataFrames do catálogo,
+            como retornado por `carregar_dataframes`
+        arquivo (Optional[str]): Caminho do .pbit ou .pbip; se informado, habilita
+            a seção "Recursos", que lê os recursos estáticos do próprio arquivo
+        obter_achados (Optional[Callable]): Produtor dos achados de qualidade,
+            como retornado por `carregar_achados`
+        
+    Returns:
+        Dict[str, Callable[[], Conteudo]]: Título da seção -> produtor do conteúdo Markdown
+    """
+    if obter_frames is None:
+        obter_frames = carregar_dataframes(layout_data, model_data)
+    if obter_achados is None:
+        obter_achados = carregar_achados(layout_data, model_data)
+    extracoes = {
+        "Páginas": lambda: extrair_paginas(layout_data),
+        "Tabelas": lambda: extrair_tabelas(model_data),
+        "Medidas": lambda: extrair_medidas(model_data),
+        "Visuais": lambda: extrair_visuais(layout_data),
+        "Fontes": lambda: extrair_fontes(model_data),
+        "Relacionamentos": lambda: extrair_relacionamentos(model_data),
+        "Estatísticas": lambda: _secao_estatisticas(obter_frames),
+        "Qualidade": lambda: _secao_qualidade(obter_achados)
+    }
+    if arquivo:
+        extracoes["Recursos"] = lambda: _secao_recursos(arquivo, layout_data)
+    return extracoes
 
-# Função para gerar o documento com conteúdo Markdown
-def gerar_documento(nome_BI: str, extracoes: Dict[str, str], modelo_path: str, salvar_path: str) -> str:
+def avaliar_secao(secao: Secao) -> Conteudo:
+    """Retorna o conteúdo da seção, executando o produtor se necessário."""
+    return secao() if callable(secao) else secao
+
+# Largura das imagens incorporadas quando o bloco não informa outra
+LARGURA_IMAGEM = 3.0
+
+def inserir_conteudo(document: Any, conteudo: Conteudo, apos: Optional[Any] = None) -> None:
     """
-    Gera o documento Word com as descrições em formato Markdown nos locais apropriados.
+    Insere o conteúdo de uma seção no documento, preservando a ordem dos blocos.
+    
+    Args:
+        document (Document): Documento Word
+        conteudo (Conteudo): Texto Markdown ou lista de blocos de texto e de
+            imagem ({"imagem": caminho, "largura": polegadas})
+        apos (Optional[Any]): Parágrafo após o qual o conteúdo é inserido. Se
+            None, o conteúdo vai para o final do documento
     """
-    # Carrega o modelo de documento do Word
-    document = Document(modelo_path)
+    blocos = [conteudo] if isinstance(conteudo, str) else conteudo
+    for bloco in blocos:
+        if isinstance(bloco, str):
+            paragrafo = document.add_paragraph(bloco)
+        else:
+            paragrafo = document.add_paragraph()
+            try:
+                paragrafo.add_run().add_picture(bloco['imagem'], width=Inches(bloco.get('largura', LARGURA_IMAGEM)))
+            except Exception as e:
+                logger.warning(f"Não foi possível incorporar a imagem {bloco['imagem']}: {e}")
+                paragrafo.add_run(f"[imagem: {os.path.basename(bloco['imagem'])}]")
+        if apos is not None:
+            apos._element.addnext(paragrafo._element)
+            apos = paragrafo
 
-    # Preenche informações básicas do documento
+def ancoras_do_modelo(document: Any) -> Dict[str, Any]:
+    """
+    Indexa os parágrafos do modelo pelo texto, para localizar os títulos das seções.
+    
+    Args:
+        document (Document): Documento Word carregado
+        
+    Returns:
+        Dict[str, Any]: Texto do parágrafo -> primeiro parágrafo com esse texto
+    """
+    ancoras = {}
+    for para in document.paragraphs:
+        ancoras.setdefault(para.text.strip(), para)
+    return ancoras
+
+def preencher_cabecalho(document: Any, nome_BI: str) -> None:
+    """Preenche a data da documentação e o nome do relatório no modelo."""
     for para in document.paragraphs:
         if "Data da documentação:" in para.text:
             para.add_run(f" {datetime.now().strftime('%d/%m/%Y')}")
         elif "Nome do Relatório:" in para.text:
             para.add_run(f" {nome_BI}")
 
+def selecionar_secoes(extracoes: Dict[str, Secao], ancoras: Dict[str, Any],
+                      secoes: Optional[Iterable[str]] = None,
+                      adicionais: Iterable[str] = ()) -> Iterator[Tuple[str, Secao, Optional[Any]]]:
+    """
+    Seleciona as seções a gerar, sem avaliá-las.
+    
+    Args:
+        extracoes (Dict[str, Secao]): Seções disponíveis
+        ancoras (Dict[str, Any]): Parágrafos do modelo indexados pelo texto
+        secoes (Optional[Iterable[str]]): Seções pedidas explicitamente
+        adicionais (Iterable[str]): Seções geradas sempre, além das selecionadas
+        
+    Yields:
+        Tuple[str, Secao, Optional[Any]]: Título, seção e parágrafo âncora no modelo
+            (None para seções pedidas que não existem no modelo)
+    """
+    solicitadas = set(secoes or ()) | set(adicionais)
+    for titulo in sorted(solicitadas - set(extracoes)):
+        logger.warning(f"Seção desconhecida ignorada: '{titulo}'. Opções: {', '.join(extracoes)}")
+    for titulo, secao in extracoes.items():
+        if secoes is not None and titulo not in solicitadas:
+            continue
+        para = ancoras.get(titulo.capitalize())
+        if para is not None or titulo in solicitadas:
+            yield titulo, secao, para
+        else:
+            logger.info(f"Seção '{titulo}' ausente do modelo; extração ignorada")
+
+# Função para gerar o documento com conteúdo Markdown
+def gerar_documento(nome_BI: str, extracoes: Dict[str, Secao], modelo_path: str, salvar_path: str,
+                    secoes: Optional[Iterable[str]] = None, adicionais: Iterable[str] = ()) -> str:
+    """
+    Gera o documento Word com as descrições em formato Markdown nos locais apropriados.
+    
+    As seções são avaliadas apenas quando o modelo contém o título correspondente.
+    Seções pedidas explicitamente em `secoes` que não existem no modelo são
+    acrescentadas ao final do documento; as demais são ignoradas sem custo.
+    """
+    # Obtém uma cópia do modelo de documento do Word já carregado
+    document = carregar_modelo_word(modelo_path)
+
+    # Preenche informações básicas do documento
+    preencher_cabecalho(document, nome_BI)
+
     # Insere cada seção Markdown no local correto do documento
-    for titulo, conteudo_markdown in extracoes.items():
-        for para in document.paragraphs:
-            if para.text.strip() == titulo.capitalize():
-                # Insere o conteúdo Markdown logo abaixo do parágrafo do título
-                paragrafo_conteudo = document.add_paragraph(conteudo_markdown)
-                para._element.addnext(paragrafo_conteudo._element)
-                break  
+    for titulo, secao, para in selecionar_secoes(extracoes, ancoras_do_modelo(document), secoes, adicionais):
+        if para is not None:
+            # Insere o conteúdo Markdown logo abaixo do parágrafo do título
+            inserir_conteudo(document, avaliar_secao(secao), para)
+        else:
+            # Seção pedida explicitamente, mas ausente do modelo: vai para o final
+            document.add_paragraph(titulo)
+            inserir_conteudo(document, avaliar_secao(secao))
 
     # Gera e salva o documento no caminho final, com controle de versão se necessário
     caminho_final = salvar_versao(salvar_path)
@@ -345,19 +392,154 @@ def gerar_documento(nome_BI: str, extracoes: Dict[str, str], modelo_path: str, s
     print(f'Documentação gerada com sucesso em: {caminho_final}')
     return caminho_final
 
+def iterar_registros(conteudo_markdown: str) -> Iterator[str]:
+    """
+    Percorre os registros de uma seção sem copiá-la para uma lista.
+    
+    Cada registro é um bloco terminado pelo separador "-----------"; a quebra de
+    linha que separa os registros no texto da seção é descartada.
+    """
+    inicio = 0
+    while inicio < len(conteudo_markdown):
+        fim = conteudo_markdown.find(SEPARADOR_REGISTRO, inicio)
+        fim = len(conteudo_markdown) if fim == -1 else fim + len(SEPARADOR_REGISTRO)
+        registro = conteudo_markdown[inicio:fim].lstrip("\n")
+        if registro.strip() and registro != SEPARADOR_REGISTRO:
+            yield registro
+        inicio = fim
+
+def contar_partes(conteudo_markdown: Conteudo, max_registros: Optional[int] = None) -> int:
+    """Número de partes que `dividir_registros` produzirá para o conteúdo."""
+    if max_registros is None or not isinstance(conteudo_markdown, str):
+        return 1
+    registros = sum(1 for _ in iterar_registros(conteudo_markdown))
+    return max(1, -(-registros // max_registros))
+
+def dividir_registros(conteudo_markdown: Conteudo, max_registros: Optional[int] = None) -> Iterator[Conteudo]:
+    """
+    Divide o conteúdo de uma seção em partes com no máximo `max_registros` registros.
+    
+    As partes são produzidas uma de cada vez, no mesmo formato do documento único
+    (registros separados por uma linha em branco). Seções com imagens (lista de
+    blocos) não são divididas.
+    
+    Args:
+        conteudo_markdown (Conteudo): Conteúdo Markdown da seção
+        max_registros (Optional[int]): Registros por parte. Se None, não divide
+        
+    Returns:
+        Iterator[Conteudo]: Partes do conteúdo, na ordem original
+        
+    Raises:
+        ValueError: Se `max_registros` for menor que 1
+    """
+    if max_registros is not None and max_registros < 1:
+        raise ValueError(f"max_registros deve ser pelo menos 1: {max_registros}")
+    if max_registros is None or not isinstance(conteudo_markdown, str):
+        return iter([conteudo_markdown])
+    return _agrupar_registros(conteudo_markdown, max_registros)
+
+def _agrupar_registros(conteudo_markdown: str, max_registros: int) -> Iterator[str]:
+    grupo: List[str] = []
+    produziu = False
+    for registro in iterar_registros(conteudo_markdown):
+        grupo.append(registro)
+        if len(grupo) == max_registros:
+            yield "\n".join([""] + grupo)
+            grupo, produziu = [], True
+    if grupo or not produziu:
+        # Sem registros, a seção vai inteira para um único volume
+        yield "\n".join([""] + grupo) if grupo else conteudo_markdown
+
+def gerar_volumes(nome_BI: str, extracoes: Dict[str, Secao], modelo_path: str, salvar_path: str,
+                  secoes: Optional[Iterable[str]] = None, max_registros: Optional[int] = None,
+                  adicionais: Iterable[str] = ()) -> str:
+    """
+    Gera a documentação dividida em vários volumes mais um documento índice.
+    
+    Cada seção vai para um ou mais volumes (conforme `max_registros`). As partes
+    são produzidas sob demanda a partir do texto da seção, e cada volume é gerado,
+    gravado e liberado antes do próximo, de modo que, além do texto da seção em
+    produção, o pico de memória fica limitado a um volume. O índice segue o modelo
+    Word e lista, sob o título de cada seção, os volumes que a contêm.
+    
+    Args:
+        nome_BI (str): Nome do relatório
+        extracoes (Dict[str, Secao]): Seções disponíveis
+        modelo_path (str): Caminho do modelo Word
+        salvar_path (str): Caminho desejado para o documento índice
+        secoes (Optional[Iterable[str]]): Seções pedidas explicitamente
+        max_registros (Optional[int]): Máximo de registros por volume. Se None,
+            gera um volume por seção
+        adicionais (Iterable[str]): Seções geradas sempre, além das selecionadas
+        
+    Returns:
+        str: Caminho do documento índice gerado
+    """
+    indice = carregar_modelo_word(modelo_path)
+    preencher_cabecalho(indice, nome_BI)
+
+    caminho_indice = salvar_versao(salvar_path)
+    base, ext = os.path.splitext(caminho_indice)
+    numero = 0
+
+    for titulo, secao, para in selecionar_secoes(extracoes, ancoras_do_modelo(indice), secoes, adicionais):
+        conteudo_secao = avaliar_secao(secao)
+        total_partes = contar_partes(conteudo_secao, max_registros)
+        linhas_indice = []
+        for parte_atual, conteudo in enumerate(dividir_registros(conteudo_secao, max_registros), start=1):
+            numero += 1
+            titulo_volume = titulo if total_partes == 1 else f"{titulo} ({parte_atual}/{total_partes})"
+            caminho_volume = f"{base}_volume_{numero:02}{ext}"
+
+            volume = criar_volume(modelo_path, nome_BI, titulo_volume)
+            inserir_conteudo(volume, conteudo)
+            volume.save(caminho_volume)
+            del volume
+            logger.info(f"Volume gravado: {caminho_volume}")
+
+            linhas_indice.append(f"Volume {numero:02}: {os.path.basename(caminho_volume)} – {titulo_volume}")
+        del conteudo_secao
+
+        texto_indice = "\n".join(linhas_indice)
+        if para is not None:
+            paragrafo_indice = indice.add_paragraph(texto_indice)
+            para._element.addnext(paragrafo_indice._element)
+        else:
+            indice.add_paragraph(titulo)
+            indice.add_paragraph(texto_indice)
+
+    indice.save(caminho_indice)
+    print(f'Documentação gerada com sucesso em: {caminho_indice} ({numero} volumes)')
+    return caminho_indice
+
 # Função principal para execução do processo
-def main(arquivo_pbit: str, modelo_word: str, diretorio_saida: str) -> Optional[str]:
+def main(arquivo_pbit: str, modelo_word: str, diretorio_saida: str,
+         secoes: Optional[Iterable[str]] = None, formato_catalogo: Optional[str] = None,
+         volumes: bool = False, max_registros: Optional[int] = None,
+         arquivo_anterior: Optional[str] = None, relatorio_qualidade: bool = False) -> Optional[str]:
     """
     Função principal que coordena o processo de documentação.
     Extrai dados do arquivo Power BI e gera a documentação em Word.
     
     Args:
-        arquivo_pbit (str): Caminho completo para o arquivo .pbit
+        arquivo_pbit (str): Caminho completo para o arquivo .pbit ou projeto .pbip
         modelo_word (str): Caminho completo para o modelo Word
         diretorio_saida (str): Diretório onde será salvo o documento gerado
-        
+        secoes (Optional[Iterable[str]]): Seções a gerar. Se None, usa as
+            seções cujos títulos existem no modelo Word
+        formato_catalogo (Optional[str]): Se informado ("xlsx" ou "csv"), exporta
+            também o catálogo do modelo em DataFrames para o diretório de saída
+        volumes (bool): Divide a documentação em um volume por seção, mais um índice
+        max_registros (Optional[int]): Máximo de registros por volume; implica `volumes`
+        arquivo_anterior (Optional[str]): Versão anterior do relatório; se informada,
+            acrescenta a seção "Diferenças" com o que mudou entre as versões
+        relatorio_qualidade (bool): Grava também os achados das regras de qualidade
+            em JSON no diretório de saída
+
     Returns:
-        Optional[str]: Caminho do arquivo gerado em caso de sucesso, None em caso de erro
+        Optional[str]: Caminho do arquivo gerado (o índice, quando há volumes) em caso
+            de sucesso, None em caso de erro
     """
     try:
         logger.info("Iniciando processo de documentação")
@@ -365,7 +547,6 @@ def main(arquivo_pbit: str, modelo_word: str, diretorio_saida: str) -> Optional[
         # Configurando caminhos
         nome_BI = Path(arquivo_pbit).stem
         caminho_BI = str(Path(arquivo_pbit).parent)
-        arquivo_zip = os.path.join(caminho_BI, f'{nome_BI}.zip')
         
         # Criar diretório de saída se não existir
         os.makedirs(diretorio_saida, exist_ok=True)
@@ -384,45 +565,42 @@ def main(arquivo_pbit: str, modelo_word: str, diretorio_saida: str) -> Optional[
         if not os.path.exists(modelo_word):
             raise FileNotFoundError(f"Modelo Word não encontrado: {modelo_word}")
         
-        # Verifica e renomeia o arquivo para .zip, se necessário
-        if not verificar_ou_renomear_arquivo(arquivo_pbit, arquivo_zip):
-            logger.error("Falha ao verificar ou renomear o arquivo.")
+        # Carrega o layout do relatório e o modelo semântico
+        dados = carregar_relatorio(arquivo_pbit)
+        if dados is None:
             return None
+        layout_data, model_data = dados
         
-        # Extrai arquivos do ZIP
-        if not extrair_arquivos_zip(arquivo_zip, caminho_BI, ['Report/Layout', 'DataModelSchema']):
-            logger.error("Falha ao extrair arquivos do ZIP.")
-            return None
+        # Dicionário de extrações em Markdown, avaliadas sob demanda
+        obter_frames = carregar_dataframes(layout_data, model_data)
+        obter_achados = carregar_achados(layout_data, model_data)
+        extracoes = criar_extracoes(layout_data, model_data, obter_frames, arquivo_pbit, obter_achados)
+        adicionais = []
+        if arquivo_anterior:
+            extracoes["Diferenças"] = lambda: _secao_diferencas(arquivo_anterior, layout_data, model_data, arquivo_pbit)
+            adicionais.append("Diferenças")
         
-        # Carrega os dados JSON
-        try:
-            layout_data = carregar_dados_json(os.path.join(caminho_BI, 'Report/Layout'))
-            model_data = carregar_dados_json(os.path.join(caminho_BI, 'DataModelSchema'))
-        except FileNotFoundError as e:
-            logger.error(f"Arquivo JSON não encontrado: {e}")
-            return None
-        
-        # Reverte o arquivo ZIP para o formato original .pbit
-        try:
-            os.rename(arquivo_zip, arquivo_pbit)
-            logger.info("Arquivo ZIP revertido para .pbit com sucesso")
-        except Exception as e:
-            logger.error(f"Erro ao reverter arquivo ZIP para .pbit: {e}")
-            return None
+        # Exporta o catálogo do modelo, se solicitado
+        if formato_catalogo:
+            from src.core.model_dataframes import exportar_catalogo
+            try:
+                exportar_catalogo(obter_frames(), diretorio_saida, nome_BI, formato_catalogo)
+            except Exception as e:
+                # O catálogo é um subproduto: a falha não impede a documentação
+                logger.error(f"Erro ao exportar catálogo; a documentação será gerada mesmo assim: {e}")
         
-        # Dicionário de extrações em Markdown
-        extracoes = {
-            "Páginas": extrair_paginas(layout_data),
-            "Tabelas": extrair_tabelas(model_data),
-            "Medidas": extrair_medidas(model_data),
-            "Visuais": extrair_visuais(layout_data),
-            "Fontes": extrair_fontes(model_data),
-            "Relacionamentos": extrair_relacionamentos(model_data)
-        }
+        # Grava o relatório de qualidade, se solicitado
+        if relatorio_qualidade:
+            from src.core.model_lint import salvar_qualidade_json
+            salvar_qualidade_json(obter_achados(), os.path.join(diretorio_saida, f'{nome_BI}_qualidade.json'))
         
         # Gera o documento final
         try:
-            caminho_final = gerar_documento(nome_BI, extracoes, modelo_word, salvar_path)
+            if volumes or max_registros:
+                caminho_final = gerar_volumes(nome_BI, extracoes, modelo_word, salvar_path, secoes, max_registros,
+                                              adicionais)
+            else:
+                caminho_final = gerar_documento(nome_BI, extracoes, modelo_word, salvar_path, secoes, adicionais)
             logger.info("Documentação gerada com sucesso!")
             return caminho_final
         except Exception as e:
@@ -432,3 +610,36 @@ def main(arquivo_pbit: str, modelo_word: str, diretorio_saida: str) -> Optional[
     except Exception as e:
         logger.error(f"Erro inesperado durante a execução: {e}")
         return None
+
+def inteiro_positivo(valor: str) -> int:
+    """Converte um argumento da linha de comando em inteiro maior ou igual a 1."""
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valor inteiro inválido: {valor}")
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"deve ser pelo menos 1: {valor}")
+    return numero
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera a documentação Word de um relatório Power BI (.pbit ou .pbip)")
+    parser.add_argument("arquivo_pbit", help="Caminho do arquivo .pbit ou do projeto .pbip")
+    parser.add_argument("modelo_word", help="Caminho do modelo Word (.docx)")
+    parser.add_argument("diretorio_saida", help="Diretório onde o documento será salvo")
+    parser.add_argument("--secoes", nargs="+", metavar="SECAO", choices=SECOES + SECOES_OPCIONAIS,
+                        help=f"Seções a gerar (padrão: as presentes no modelo). Opções: {', '.join(SECOES + SECOES_OPCIONAIS)}")
+    parser.add_argument("--catalogo", choices=["xlsx", "csv"],
+                        help="Exporta também o catálogo do modelo (colunas, medidas, partições, relacionamentos e visuais)")
+    parser.add_argument("--volumes", action="store_true",
+                        help="Divide a documentação em um volume por seção, mais um documento índice")
+    parser.add_argument("--max-registros", type=inteiro_positivo, metavar="N",
+                        help="Máximo de registros por volume (implica --volumes)")
+    parser.add_argument("--comparar", metavar="ANTERIOR",
+                        help="Versão anterior do relatório; acrescenta a seção Diferenças")
+    parser.add_argument("--qualidade", action="store_true",
+                        help="Grava também os achados das regras de qualidade em JSON")
+    args = parser.parse_args()
+    resultado = main(args.arquivo_pbit, args.modelo_word, args.diretorio_saida, args.secoes, args.catalogo,
+                     args.volumes, args.max_registros, args.comparar, args.qualidade)
+    if resultado is None:
+        raise SystemExit(1)
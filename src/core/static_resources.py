@@ -0,0 +1,220 @@
+"""
+Recursos estáticos do relatório Power BI
+----------------------------------------
+
+Lista os recursos de `Report/StaticResources` (imagens de fundo, logotipos, temas
+personalizados) diretamente do arquivo `.pbit`, sem extraí-lo, ou da pasta
+`StaticResources` de um projeto `.pbip`.
+
+Cada recurso é identificado pelo hash do seu conteúdo. As imagens que podem ser
+incorporadas ao Word são gravadas uma única vez em um repositório local, mesmo
+quando usadas por várias páginas ou relatórios, e suas miniaturas também são
+guardadas pelo hash, de modo que lotes grandes não decodificam nem redimensionam
+a mesma imagem repetidamente.
+"""
+
+import os
+import json
+import hashlib
+import zipfile
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+
+from src.utils.config import CACHE_DIR
+from src.core.pbir_loader import localizar_pasta_relatorio
+from src.core.report_common import SEPARADOR_REGISTRO, JsonDict
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow consta do requirements.txt; sem ele as imagens vão no tamanho original
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+PREFIXO_RECURSOS = 'Report/StaticResources/'
+RECURSOS_DIR = CACHE_DIR / 'recursos'
+MINIATURAS_DIR = CACHE_DIR / 'miniaturas'
+
+# Formatos que o Word consegue incorporar como imagem
+FORMATOS_IMAGEM = {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}
+TAMANHO_MINIATURA = (320, 320)
+
+# Tipos de item em `resourcePackages` que identificam os temas aplicados ao relatório
+TIPOS_TEMA = {201: 'Tema do relatório', 202: 'Tema base do relatório'}
+
+# Miniaturas já resolvidas neste processo: hash -> caminho (ou None)
+_miniaturas: Dict[str, Optional[str]] = {}
+
+
+def _iterar_arquivos(arquivo: str) -> Iterator[Tuple[str, bytes]]:
+    """Percorre (caminho relativo a StaticResources, conteúdo) dos recursos."""
+    if arquivo.lower().endswith('.pbip') or os.path.isdir(arquivo):
+        pasta = localizar_pasta_relatorio(arquivo) / 'StaticResources'
+        if not pasta.is_dir():
+            return
+        for caminho in sorted(pasta.rglob('*')):
+            if caminho.is_file():
+                yield caminho.relative_to(pasta).as_posix(), caminho.read_bytes()
+        return
+
+    with zipfile.ZipFile(arquivo, 'r') as zip_ref:
+        for info in zip_ref.infolist():
+            if info.filename.startswith(PREFIXO_RECURSOS) and not info.is_dir():
+                yield info.filename[len(PREFIXO_RECURSOS):], zip_ref.read(info)
+
+
+def _armazenar(conteudo: bytes, extensao: str) -> Tuple[str, Optional[Path]]:
+    """
+    Calcula o hash do conteúdo e, se for uma imagem incorporável, grava-o no
+    repositório (apenas se ainda não existir).
+    """
+    digest = hashlib.sha256(conteudo).hexdigest()
+    if extensao not in FORMATOS_IMAGEM:
+        return digest, None
+    destino = RECURSOS_DIR / f"{digest}{extensao}"
+    if not destino.exists():
+        RECURSOS_DIR.mkdir(parents=True, exist_ok=True)
+        temporario = destino.with_suffix(destino.suffix + '.tmp')
+        temporario.write_bytes(conteudo)
+        os.replace(temporario, destino)
+    return digest, destino
+
+
+def _paginas_por_texto(layout_data: JsonDict) -> List[Tuple[str, str]]:
+    """Texto serializado de cada página (configuração e visuais), para localizar referências."""
+    paginas = []
+    for section in layout_data.get('sections', []):
+        partes = [section.get('config', '')]
+        partes.extend(container.get('config', '') for container in section.get('visualContainers', []))
+        texto = ''.join(parte if isinstance(parte, str) else json.dumps(parte) for parte in partes)
+        paginas.append((section.get('displayName', 'Sem Nome'), texto))
+    return paginas
+
+
+def _temas_registrados(layout_data: JsonDict) -> Dict[str, str]:
+    """Caminho do recurso (pacote/arquivo) -> uso como tema, segundo `resourcePackages`."""
+    temas = {}
+    for entrada in layout_data.get('resourcePackages', []):
+        pacote = entrada.get('resourcePackage', {})
+        for item in pacote.get('items', []):
+            if item.get('type') in TIPOS_TEMA:
+                temas[f"{pacote.get('name')}/{item.get('path')}"] = TIPOS_TEMA[item['type']]
+    return temas
+
+
+def listar_recursos(arquivo: str, layout_data: Optional[JsonDict] = None) -> List[JsonDict]:
+    """
+    Lista os recursos estáticos do relatório, gravando cada imagem uma única vez.
+
+    Args:
+        arquivo (str): Caminho do arquivo .pbit ou do projeto .pbip
+        layout_data (Optional[JsonDict]): Layout do relatório, usado para indicar
+            em que páginas cada recurso é utilizado
+
+    Returns:
+        List[JsonDict]: Nome, pacote, tipo, tamanho, hash, caminho no repositório
+            (None para formatos que não são incorporados) e páginas que utilizam
+            cada recurso
+    """
+    paginas = _paginas_por_texto(layout_data) if layout_data else []
+    temas = _temas_registrados(layout_data) if layout_data else {}
+
+    recursos = []
+    for caminho, conteudo in _iterar_arquivos(arquivo):
+        nome = caminho.rsplit('/', 1)[-1]
+        extensao = os.path.splitext(nome)[1].lower()
+        digest, destino = _armazenar(conteudo, extensao)
+
+        recurso = {
+            'nome': nome,
+            'pacote': caminho.split('/', 1)[0],
+            'tipo': extensao.lstrip('.') or 'desconhecido',
+            'tamanho': len(conteudo),
+            'hash': digest,
+            'caminho': str(destino) if destino else None,
+            'paginas': [pagina for pagina, texto in paginas if nome in texto],
+        }
+        if extensao == '.json':
+            try:
+                recurso['tema'] = json.loads(conteudo.decode('utf-8-sig')).get('name')
+            except (UnicodeDecodeError, json.JSONDecodeError, AttributeError):
+                pass
+        if caminho in temas:
+            recurso['paginas'].insert(0, temas[caminho])
+        recursos.append(recurso)
+
+    logger.info(f"{len(recursos)} recursos estáticos encontrados em: {arquivo}")
+    return recursos
+
+
+def obter_miniatura(recurso: JsonDict) -> Optional[str]:
+    """
+    Retorna o caminho da miniatura de um recurso de imagem, gerando-a uma única vez.
+
+    Args:
+        recurso (JsonDict): Recurso retornado por `listar_recursos`
+
+    Returns:
+        Optional[str]: Caminho da miniatura, ou None se o recurso não for uma
+            imagem que o Word consiga incorporar
+    """
+    digest = recurso['hash']
+    if digest in _miniaturas:
+        return _miniaturas[digest]
+
+    miniatura = None
+    if recurso['caminho']:
+        if Image is None:
+            miniatura = recurso['caminho']
+        else:
+            destino = MINIATURAS_DIR / f"{digest}.png"
+            if not destino.exists():
+                try:
+                    MINIATURAS_DIR.mkdir(parents=True, exist_ok=True)
+                    temporario = destino.with_suffix(destino.suffix + '.tmp')
+                    with Image.open(recurso['caminho']) as imagem:
+                        imagem.thumbnail(TAMANHO_MINIATURA)
+                        imagem.save(temporario, 'PNG')
+                    os.replace(temporario, destino)
+                except OSError as e:
+                    logger.warning(f"Não foi possível gerar miniatura de {recurso['nome']}: {e}")
+                    destino = Path(recurso['caminho'])
+            miniatura = str(destino)
+
+    _miniaturas[digest] = miniatura
+    return miniatura
+
+
+def extrair_recursos(arquivo: str, layout_data: Optional[JsonDict] = None) -> List[Any]:
+    """
+    Extrai e organiza os recursos estáticos em formato Markdown, com as imagens.
+
+    Returns:
+        List[Any]: Blocos de texto e de imagem ({"imagem": caminho}) da seção
+    """
+    blocos: List[Any] = [""]
+    incorporados: Dict[str, str] = {}
+    for recurso in listar_recursos(arquivo, layout_data):
+        linhas = [
+            f"Recurso: {recurso['nome']}",
+            f"Pacote: {recurso['pacote']}",
+            f"Tipo: {recurso['tipo']}",
+            f"Tamanho: {recurso['tamanho'] / 1024:.1f} KB",
+            f"Hash: {recurso['hash'][:12]}",
+        ]
+        if recurso.get('tema'):
+            linhas.append(f"Tema: {recurso['tema']}")
+        linhas.append(f"Utilizado em: {', '.join(recurso['paginas']) if recurso['paginas'] else 'Não referenciado nas páginas'}")
+
+        miniatura = obter_miniatura(recurso)
+        if miniatura and recurso['hash'] in incorporados:
+            linhas.append(f"Mesmo conteúdo de: {incorporados[recurso['hash']]}")
+            miniatura = None
+
+        blocos.append("\n".join(linhas) + "\n")
+        if miniatura:
+            incorporados[recurso['hash']] = recurso['nome']
+            blocos.append({'imagem': miniatura})
+        blocos.append(SEPARADOR_REGISTRO)
+    return blocos
@@ -0,0 +1,340 @@
+"""
+Leitura do modelo semântico em TMDL
+-----------------------------------
+
+Em projetos `.pbip` o modelo fica em arquivos TMDL (`definition/tables/*.tmdl`,
+`relationships.tmdl`, ...) em vez do `DataModelSchema` em JSON. Este módulo
+converte esses arquivos para a mesma estrutura do `DataModelSchema`
+(`{"model": {"tables": [...], "relationships": [...]}}`), consumida por
+`extrair_tabelas`, `extrair_medidas`, `extrair_fontes` e `extrair_relacionamentos`.
+
+O parser percorre cada arquivo uma única vez, linha a linha, usando a indentação
+para decidir a que objeto cada propriedade pertence. Expressões DAX/M de várias
+linhas são consumidas no mesmo passo, sem retrocesso, de modo que o tempo de
+leitura é linear no tamanho total do texto do modelo.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union, Any
+
+logger = logging.getLogger(__name__)
+
+JsonDict = Dict[str, Any]
+Expressao = Union[str, List[str]]
+
+# Palavras-chave que declaram objetos no TMDL
+OBJETOS = {
+    'model', 'database', 'table', 'column', 'measure', 'partition', 'relationship',
+    'hierarchy', 'level', 'annotation', 'extendedProperty', 'calculationGroup',
+    'calculationItem', 'role', 'tablePermission', 'member', 'perspective',
+    'perspectiveTable', 'perspectiveColumn', 'perspectiveMeasure', 'perspectiveHierarchy',
+    'culture', 'linguisticMetadata', 'expression', 'dataSource', 'queryGroup', 'ref',
+    'function', 'calendar',
+}
+
+# Coleção em que cada tipo de objeto é guardado no objeto pai
+PLURAIS = {'hierarchy': 'hierarchies'}
+
+DELIMITADOR = '```'
+
+
+def _plural(tipo: str) -> str:
+    return PLURAIS.get(tipo, f"{tipo}s")
+
+
+def _indentacao(linha: str) -> int:
+    """Nível de indentação da linha (um tab ou quatro espaços por nível)."""
+    nivel = espacos = 0
+    for caractere in linha:
+        if caractere == '\t':
+            nivel += 1
+            espacos = 0
+        elif caractere == ' ':
+            espacos += 1
+            if espacos == 4:
+                nivel += 1
+                espacos = 0
+        else:
+            break
+    return nivel
+
+
+def _ler_nome(texto: str) -> Tuple[str, str]:
+    """
+    Lê um nome TMDL, opcionalmente entre aspas simples ('' escapa a aspa).
+
+    Returns:
+        Tuple[str, str]: (nome, restante do texto após o nome)
+    """
+    if texto.startswith("'"):
+        partes = []
+        j = 1
+        while j < len(texto):
+            if texto[j] == "'":
+                if texto[j + 1:j + 2] == "'":
+                    partes.append("'")
+                    j += 2
+                    continue
+                return ''.join(partes), texto[j + 1:]
+            partes.append(texto[j])
+            j += 1
+        return ''.join(partes), ''
+
+    fim = len(texto)
+    for j, caractere in enumerate(texto):
+        if caractere in ' \t=':
+            fim = j
+            break
+    return texto[:fim], texto[fim:]
+
+
+def _converter_valor(valor: str) -> Any:
+    """Converte o valor de uma propriedade `chave: valor`."""
+    valor = valor.strip()
+    if len(valor) >= 2 and valor[0] == '"' and valor[-1] == '"':
+        return valor[1:-1].replace('""', '"')
+    if valor == 'true':
+        return True
+    if valor == 'false':
+        return False
+    return valor
+
+
+def _dividir_referencia(referencia: str) -> Tuple[str, str]:
+    """Divide uma referência `Tabela.Coluna` (com ou sem aspas) em (tabela, coluna)."""
+    referencia = referencia.strip()
+    if referencia.startswith("'"):
+        tabela, resto = _ler_nome(referencia)
+        resto = resto[1:] if resto.startswith('.') else resto
+    else:
+        tabela, _, resto = referencia.partition('.')
+    coluna = _ler_nome(resto)[0] if resto.startswith("'") else resto
+    return tabela, coluna
+
+
+def _ler_expressao(linhas: List[str], i: int, nivel: int, inline: Optional[str]) -> Tuple[Optional[Expressao], int]:
+    """
+    Consome a expressão que começa após o `=` de uma declaração ou propriedade.
+
+    As linhas de continuação são as que estão mais indentadas que as propriedades
+    do objeto (nível + 1), ou todas até o fechamento de um bloco entre ```.
+
+    Args:
+        linhas (List[str]): Linhas do arquivo
+        i (int): Índice da primeira linha após a declaração
+        nivel (int): Indentação da linha da declaração
+        inline (Optional[str]): Texto após o `=` na própria linha, ou None sem `=`
+
+    Returns:
+        Tuple[Optional[Expressao], int]: Expressão (texto ou lista de linhas, como no
+            DataModelSchema) e índice da próxima linha a interpretar
+    """
+    if inline is None:
+        return None, i
+
+    corpo: List[str] = []
+    if inline.startswith(DELIMITADOR):
+        inline = inline[len(DELIMITADOR):]
+        if DELIMITADOR in inline:
+            return inline[:inline.index(DELIMITADOR)].strip(), i
+        while i < len(linhas) and DELIMITADOR not in linhas[i]:
+            corpo.append(linhas[i])
+            i += 1
+        if i < len(linhas):
+            final = linhas[i][:linhas[i].index(DELIMITADOR)]
+            if final.strip():
+                corpo.append(final)
+            i += 1
+    else:
+        while i < len(linhas):
+            linha = linhas[i]
+            if linha.strip():
+                if _indentacao(linha) <= nivel + 1:
+                    break
+            corpo.append(linha)
+            i += 1
+
+    while corpo and not corpo[-1].strip():
+        corpo.pop()
+
+    # Remove a indentação comum das linhas do corpo
+    margens = [len(linha) - len(linha.lstrip()) for linha in corpo if linha.strip()]
+    margem = min(margens) if margens else 0
+    resultado = ([inline.strip()] if inline.strip() else []) + [linha[margem:] for linha in corpo]
+
+    if not resultado:
+        return '', i
+    if len(resultado) == 1:
+        return resultado[0], i
+    return resultado, i
+
+
+def _criar_objeto(tipo: str, nome: str, expressao: Optional[Expressao], raiz: JsonDict,
+                  pai: JsonDict) -> JsonDict:
+    """Cria o objeto declarado e o anexa à coleção correspondente."""
+    if tipo == 'model':
+        raiz['name'] = nome
+        return raiz
+
+    objeto: JsonDict = {'name': nome}
+    if tipo == 'table':
+        objeto.update({'columns': [], 'measures': [], 'partitions': []})
+        raiz.setdefault('tables', []).append(objeto)
+        return objeto
+    if tipo == 'relationship':
+        raiz.setdefault('relationships', []).append(objeto)
+        return objeto
+
+    if tipo == 'partition':
+        objeto['source'] = {'type': expressao}
+    elif tipo == 'column' and expressao is not None:
+        objeto['type'] = 'calculated'
+        objeto['expression'] = expressao
+    elif tipo == 'annotation':
+        objeto['value'] = expressao
+    elif expressao is not None:
+        objeto['expression'] = expressao
+    pai.setdefault(_plural(tipo), []).append(objeto)
+    return objeto
+
+
+def parse_tmdl(texto: str) -> JsonDict:
+    """
+    Converte o texto de um arquivo TMDL na estrutura do DataModelSchema.
+
+    Args:
+        texto (str): Conteúdo do arquivo .tmdl
+
+    Returns:
+        JsonDict: Objeto do modelo com as chaves "tables", "relationships" etc.
+            que aparecem no arquivo
+    """
+    raiz: JsonDict = {}
+    # Pilha de (indentação, objeto, tipo) dos objetos abertos
+    pilha: List[Tuple[int, JsonDict, str]] = [(-1, raiz, 'model')]
+    descricao: List[str] = []
+    linhas = texto.splitlines()
+    i = 0
+
+    while i < len(linhas):
+        linha = linhas[i]
+        i += 1
+        conteudo = linha.strip()
+        if not conteudo:
+            continue
+        if conteudo.startswith('///'):
+            descricao.append(conteudo[3:].strip())
+            continue
+
+        nivel = _indentacao(linha)
+        while pilha[-1][0] >= nivel:
+            pilha.pop()
+
+        palavra, _, resto = conteudo.partition(' ')
+        resto = resto.lstrip()
+        if palavra in OBJETOS and resto and resto[0] not in '=:':
+            nome, depois = _ler_nome(resto)
+            depois = depois.strip()
+            inline = depois[1:].strip() if depois.startswith('=') else None
+            if palavra == 'ref':
+                # "ref table X" registra apenas a ordem dos objetos
+                tipo_ref = nome
+                nome, _ = _ler_nome(depois)
+                pilha[-1][1].setdefault('refs', []).append({'type': tipo_ref, 'name': nome})
+                continue
+            expressao, i = _ler_expressao(linhas, i, nivel, inline)
+            objeto = _criar_objeto(palavra, nome, expressao, raiz, pilha[-1][1])
+            if descricao:
+                objeto['description'] = '\n'.join(descricao)
+                descricao = []
+            pilha.append((nivel, objeto, palavra))
+            continue
+
+        descricao = []
+        alvo, tipo_alvo = pilha[-1][1], pilha[-1][2]
+        pos_dois_pontos = conteudo.find(':')
+        pos_igual = conteudo.find('=')
+        if pos_dois_pontos != -1 and (pos_igual == -1 or pos_dois_pontos < pos_igual):
+            chave = conteudo[:pos_dois_pontos].strip()
+            alvo[chave] = _converter_valor(conteudo[pos_dois_pontos + 1:])
+        elif pos_igual != -1:
+            chave = conteudo[:pos_igual].strip()
+            expressao, i = _ler_expressao(linhas, i, nivel, conteudo[pos_igual + 1:].strip())
+            if tipo_alvo == 'partition' and chave == 'source':
+                alvo['source']['expression'] = expressao
+            else:
+                alvo[chave] = expressao
+        else:
+            # Propriedade booleana sem valor, ex.: "isHidden"
+            alvo[conteudo] = True
+
+    for tabela in raiz.get('tables', []):
+        for coluna in tabela['columns']:
+            # Colunas de tabelas calculadas referenciam a origem como "[Coluna]"
+            if 'type' not in coluna and str(coluna.get('sourceColumn', '')).startswith('['):
+                coluna['type'] = 'calculatedTableColumn'
+
+    for relacionamento in raiz.get('relationships', []):
+        for lado in ('from', 'to'):
+            referencia = relacionamento.get(f'{lado}Column')
+            if isinstance(referencia, str) and f'{lado}Table' not in relacionamento:
+                relacionamento[f'{lado}Table'], relacionamento[f'{lado}Column'] = _dividir_referencia(referencia)
+    return raiz
+
+
+def _ler_arquivo_tmdl(caminho: Path) -> JsonDict:
+    with open(caminho, 'r', encoding='utf-8-sig') as f:
+        return parse_tmdl(f.read())
+
+
+def carregar_modelo_tmdl(pasta_modelo: str, max_workers: Optional[int] = None) -> JsonDict:
+    """
+    Carrega o modelo semântico TMDL de um projeto `.pbip`.
+
+    Args:
+        pasta_modelo (str): Caminho da pasta .SemanticModel (ou da sua pasta definition)
+        max_workers (Optional[int]): Número de threads para ler os arquivos das
+            tabelas. Defaults to None (padrão do ThreadPoolExecutor)
+
+    Returns:
+        JsonDict: Dicionário no formato do DataModelSchema
+
+    Raises:
+        FileNotFoundError: Se a pasta não contiver arquivos TMDL
+    """
+    definicao = Path(pasta_modelo)
+    if (definicao / 'definition').is_dir():
+        definicao = definicao / 'definition'
+
+    arquivos_tabelas = sorted((definicao / 'tables').glob('*.tmdl')) if (definicao / 'tables').is_dir() else []
+    arquivos_raiz = [definicao / nome for nome in ('database.tmdl', 'model.tmdl', 'expressions.tmdl', 'relationships.tmdl')
+                     if (definicao / nome).is_file()]
+    if not arquivos_tabelas and not arquivos_raiz:
+        raise FileNotFoundError(f"Nenhum arquivo TMDL encontrado em: {definicao}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        partes = list(executor.map(_ler_arquivo_tmdl, arquivos_raiz + arquivos_tabelas))
+
+    model: JsonDict = {}
+    tabelas: List[JsonDict] = []
+    nome_banco = ''
+    for caminho, parte in zip(arquivos_raiz + arquivos_tabelas, partes):
+        if caminho.name == 'database.tmdl':
+            nome_banco = next(iter(parte.get('databases', [])), {}).get('name', '')
+            continue
+        tabelas.extend(parte.pop('tables', []))
+        for chave, valor in parte.items():
+            if isinstance(valor, list):
+                model.setdefault(chave, []).extend(valor)
+            else:
+                model[chave] = valor
+
+    # Respeita a ordem das tabelas declarada no model.tmdl ("ref table ...")
+    ordem = {ref['name']: i for i, ref in enumerate(model.pop('refs', [])) if ref.get('type') == 'table'}
+    tabelas.sort(key=lambda tabela: ordem.get(tabela['name'], len(ordem)))
+    model['tables'] = tabelas
+
+    logger.info(f"Modelo TMDL carregado: {len(tabelas)} tabelas de {definicao}")
+    return {'name': nome_banco, 'model': model}
@@ -2,6 +2,7 @@ import flet as ft
 from pathlib import Path
 from src.core.document_generator import DocumentGenerator
 from src.core.pbix_converter import convert_pbix_to_pbit
+from src.core.smartdoc_sem_ia import SECOES, SECOES_OPCIONAIS
 from src.utils.config import (
     APP_NAME,
     WINDOW_WIDTH,
@@ -35,8 +36,14 @@ class MainWindow:
         self.pick_pbit_dialog = ft.FilePicker(
             on_result=self.pick_pbit_file
         )
-        self.pick_pbit_dialog.allowed_extensions = ["pbit", "pbix"]
+        self.pick_pbit_dialog.allowed_extensions = ["pbit", "pbix", "pbip"]
         self.pick_word_dialog = ft.FilePicker(on_result=self.pick_word_template)
+        self.secoes_checkboxes = {
+            secao: ft.Checkbox(label=secao, value=secao in SECOES)
+            for secao in SECOES + SECOES_OPCIONAIS
+        }
+        self.exportar_catalogo = ft.Checkbox(label="Exportar catálogo do modelo (Excel)", value=False)
+        self.dividir_volumes = ft.Checkbox(label="Dividir em volumes por seção", value=False)
         
         self.page.overlay.extend([
             self.pick_pbit_dialog,
@@ -81,7 +88,7 @@ class MainWindow:
                     size=16
                 ),
                 ft.Text(
-                    "Você pode usar arquivos .pbix ou .pbit - arquivos .pbix serão convertidos automaticamente",
+                    "Você pode usar arquivos .pbix, .pbit ou projetos .pbip - arquivos .pbix serão convertidos automaticamente",
                     size=14,
                     color=ft.colors.SECONDARY
                 )
@@ -94,7 +101,7 @@ class MainWindow:
             ft.Container(
                 content=ft.Column([
                     ft.Text("Como Usar:", size=16, weight=ft.FontWeight.BOLD),
-                    ft.Text("1. Selecione um arquivo .pbix ou .pbit"),
+                    ft.Text("1. Selecione um arquivo .pbix, .pbit ou .pbip"),
                     ft.Text("2. Selecione um modelo Word (opcional)"),
                     ft.Text("3. Clique em 'Gerar Documentação'"),
                 ]),
@@ -122,7 +129,7 @@ class MainWindow:
             ft.Container(
                 content=ft.Column([
                     ft.FilledButton(
-                        "Selecionar arquivo PBIT/PBIX",
+                        "Selecionar arquivo PBIT/PBIX/PBIP",
                         icon=ft.icons.FILE_UPLOAD,
                         on_click=lambda _: self.pick_pbit_dialog.pick_files(),
                     ),
@@ -145,6 +152,17 @@ class MainWindow:
             ),
         ])
 
+        # Seleção de seções
+        sections_selector = ft.Container(
+            content=ft.Column([
+                ft.Text("Seções a gerar:", size=16, weight=ft.FontWeight.BOLD),
+                ft.Row(list(self.secoes_checkboxes.values()), wrap=True),
+                self.exportar_catalogo,
+                self.dividir_volumes,
+            ]),
+            padding=10,
+        )
+
         # Generate button
         generate_button = ft.Container(
             content=ft.ElevatedButton(
@@ -170,6 +188,7 @@ class MainWindow:
                     margin=ft.margin.only(bottom=20),
                 ),
                 form_controls,
+                sections_selector,
                 generate_button,
             ]),
             expand=True,
@@ -220,12 +239,17 @@ class MainWindow:
             self.modelo_word.value = e.files[0].path
             self.page.update()
 
+    def selected_sections(self):
+        """Retorna as seções marcadas, ou None se a seleção for a padrão do modelo"""
+        secoes = [secao for secao, checkbox in self.secoes_checkboxes.items() if checkbox.value]
+        return None if secoes == SECOES else secoes
+
     def generate_documentation(self, e):
         """Gera a documentação usando os parâmetros selecionados"""
         if not self.arquivo_pbit.value:
             self.page.show_snack_bar(
                 ft.SnackBar(
-                    content=ft.Text("Por favor, selecione o arquivo PBIT/PBIX"),
+                    content=ft.Text("Por favor, selecione o arquivo PBIT/PBIX/PBIP"),
                     action="OK"
                 )
             )
@@ -241,13 +265,25 @@ class MainWindow:
             generator = DocumentGenerator()
             output_file = generator.generate(
                 self.arquivo_pbit.value,
-                self.modelo_word.value if self.modelo_word.value else None
+                self.modelo_word.value if self.modelo_word.value else None,
+                self.selected_sections(),
+                "xlsx" if self.exportar_catalogo.value else None,
+                self.dividir_volumes.value
             )
 
             # Remove a barra de progresso
             self.page.remove(progress)
             self.page.update()
 
+            if not output_file:
+                self.page.show_snack_bar(
+                    ft.SnackBar(
+                        content=ft.Text("Erro ao gerar documentação. Verifique o arquivo power_bi_doc.log"),
+                        action="OK"
+                    )
+                )
+                return
+
             # Mostra mensagem de sucesso
             self.page.show_snack_bar(
                 ft.SnackBar(
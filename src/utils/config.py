@@ -4,6 +4,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "output"
 TEMPLATES_DIR = PROJECT_ROOT / "templates"
+CACHE_DIR = PROJECT_ROOT / "cache"
 
 # Configurações da aplicação
 APP_NAME = "Power BI Documentator"